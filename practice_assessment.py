@@ -1,24 +1,200 @@
-def flatten_nested_list(nested_list: list) -> list:
+import array
+import codecs
+import csv
+import heapq
+import json
+import mmap
+import os
+import pickle
+import re
+import struct
+import sys
+import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, compress, groupby, islice, repeat
+from math import gcd, isqrt, log, prod
+from operator import add, itemgetter, mul, sub, truediv
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
+def iter_flatten(nested: list, max_depth: int = None):
+    """
+    Lazily yield the leaves of a nested list of any depth.
+    
+    Uses an explicit stack of iterators instead of recursion, so arbitrarily
+    deep inputs work and no intermediate lists are built.
+    
+    Args:
+        nested: A list that may contain other lists
+        max_depth: Number of nesting levels to flatten; lists nested deeper
+            are yielded as they are (default: flatten everything)
+        
+    Yields:
+        The non-list elements, in order
+        
+    Example:
+        list(iter_flatten([1, [2, [3, [4]]]])) -> [1, 2, 3, 4]
+        list(iter_flatten([1, [2, [3, [4]]]], max_depth=1)) -> [1, 2, [3, [4]]]
+    """
+    stack = [iter(nested)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list) and (max_depth is None or len(stack) <= max_depth):
+                stack.append(iter(item))
+                break
+            yield item
+        else:
+            stack.pop()
+
+
+# Byte order named by each struct format prefix; None is the host's own.
+_BYTE_ORDER_NATIVE = {'@': None, '=': None, '<': 'little', '>': 'big', '!': 'big'}
+
+
+def _flatten_into_array(nested: list, out: array.array) -> None:
+    """
+    Append the leaves of nested to a typed array.
+    
+    Lists of plain numbers go through array.fromlist in one call, which
+    leaves the array untouched and raises TypeError when the list holds
+    anything else; those lists are walked item by item instead. Leaves that
+    expose the buffer protocol are bulk-copied: buffers of the same item
+    format and byte order are copied as raw memory, and other formats
+    (including bytes and bytearray, whose format is 'B', and explicit
+    byte orders such as ctypes' '<d') are converted value by value.
+    """
+    typecode = out.typecode
+    stack = [iter((nested,))]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, list):
+                try:
+                    out.fromlist(item)
+                except TypeError:
+                    stack.append(iter(item))
+                    break
+            elif isinstance(item, (int, float)):
+                out.append(item)
+            elif isinstance(item, array.array) and item.typecode == typecode:
+                out.extend(item)
+            else:
+                try:
+                    view = memoryview(item)
+                except TypeError:
+                    out.append(item)
+                    continue
+                with view:
+                    fmt = view.format
+                    order = fmt[0] if fmt[:1] in _BYTE_ORDER_NATIVE else '@'
+                    native = _BYTE_ORDER_NATIVE[order] in (None, sys.byteorder)
+                    if native and fmt.lstrip('@=<>!') == typecode and view.itemsize == out.itemsize:
+                        if view.c_contiguous and order == '@':
+                            with view.cast('B') as data:
+                                out.frombytes(data)
+                        else:
+                            out.frombytes(view.tobytes())
+                    elif order == '@':
+                        out.fromlist(list(iter_flatten([view.tolist()])))
+                    else:
+                        # memoryview.tolist only decodes native formats.
+                        out.extend(value for value, in struct.iter_unpack(fmt, view.tobytes()))
+        else:
+            stack.pop()
+
+
+def flatten_nested_list(nested_list: list, dtype: str = None, as_numpy: bool = False) -> list:
     """
     Flatten a nested list of any depth into a single list.
     
     Args:
         nested_list: A list that may contain other lists
+        dtype: Optional array typecode (e.g. 'd', 'q'); when given, leaves
+            are written straight into an array.array of that type instead
+            of a list, and buffer-protocol leaves are bulk-copied. Buffers
+            are read as values of their own format, so bytes and bytearray
+            leaves contribute one number per byte
+        as_numpy: Return a NumPy array sharing the typed result's memory
+            (dtype defaults to 'd'); requires NumPy
         
     Returns:
-        A flat list containing all elements
+        A flat list containing all elements, or an array.array / NumPy
+        array when dtype / as_numpy is given
         
     Example:
         flatten_nested_list([1, [2, 3], [4, [5, 6]]]) -> [1, 2, 3, 4, 5, 6]
+        flatten_nested_list([1, [2.5, array('d', [3, 4])]], dtype='d')
+        -> array('d', [1.0, 2.5, 3.0, 4.0])
+    """
+    if dtype is None and not as_numpy:
+        return list(iter_flatten(nested_list))
+    
+    if as_numpy and np is None:
+        raise ImportError('as_numpy=True requires NumPy')
+    out = array.array(dtype or 'd')
+    _flatten_into_array(nested_list, out)
+    if as_numpy:
+        return np.frombuffer(out, dtype=out.typecode)
+    return out
+
+def merge_catalogs_many(*catalogs: dict, into: dict = None, combine=None) -> dict:
+    """
+    Merge any number of product catalogs in a single pass.
+    
+    Products found in more than one catalog have their quantities combined
+    (summed by default); the others are copied as they are.
+    
+    Args:
+        *catalogs: {'product_name': quantity} mappings, merged in order
+        into: Optional dict to merge into in place; its own quantities take
+            part in the merge (default: a new dict)
+        combine: Function of two arguments (existing, incoming) -> quantity,
+            such as max or operator.add (default: +); the one-argument
+            builtin sum is accepted and means the default
+        
+    Returns:
+        The merged catalog (into, when given)
+        
+    Example:
+        merge_catalogs_many({'apple': 5}, {'apple': 2, 'pear': 1}, {'pear': 3})
+        -> {'apple': 7, 'pear': 4}
+        merge_catalogs_many({'apple': 5}, {'apple': 2}, combine=max)
+        -> {'apple': 5}
     """
-    flat = []
-    for i in nested_list:
-        if isinstance(i, list):
-            flat.extend(flatten_nested_list(i))
+    if combine is sum:
+        combine = None
+    merged = {} if into is None else into
+    for catalog in catalogs:
+        if not merged:
+            merged.update(catalog)
+            continue
+        if combine is None:
+            for product, quantity in catalog.items():
+                if product in merged:
+                    merged[product] += quantity
+                else:
+                    merged[product] = quantity
         else:
-            flat.append(i)
+            for product, quantity in catalog.items():
+                if product in merged:
+                    merged[product] = combine(merged[product], quantity)
+                else:
+                    merged[product] = quantity
     
-    return flat
+    return merged
+
 
 def merge_catalogs(catalog_a: dict, catalog_b: dict) -> dict:
     """
@@ -36,22 +212,218 @@ def merge_catalogs(catalog_a: dict, catalog_b: dict) -> dict:
         merge_catalogs({'apple': 5, 'banana': 3}, {'apple': 2, 'orange': 4})
         -> {'apple': 7, 'banana': 3, 'orange': 4}
     """
-    complete_catalog = {}
-    complete_catalog = complete_catalog | catalog_a
-    for k, v in catalog_b.items():
-        if k in complete_catalog.keys():
-            complete_catalog[k] = complete_catalog[k] + catalog_b[k]
-        else:
-            complete_catalog[k] = v
+    return merge_catalogs_many(catalog_a, catalog_b)
+
+_CATALOG_MERGE_FANIN = 128
+
+
+def _parse_quantity(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _iter_catalog_csv(path: str):
+    """Yield (product, quantity) pairs from a product,quantity CSV file."""
+    with open(path, newline='') as file:
+        for row in csv.reader(file):
+            if row:
+                yield row[0], _parse_quantity(row[1])
+
+
+def _iter_summed(pairs):
+    """Sum the quantities of consecutive (product, quantity) pairs with equal products."""
+    for product, group in groupby(pairs, key=itemgetter(0)):
+        _, total = next(group)
+        for _, quantity in group:
+            total += quantity
+        yield product, total
+
+
+def _write_catalog_csv(pairs, path: str) -> None:
+    with open(path, 'w', newline='') as out:
+        csv.writer(out).writerows(pairs)
+
+
+def merge_catalog_files(paths: list, dst: str, run_size: int = 1000000, tmpdir: str = None) -> None:
+    """
+    Merge catalogs stored as CSV files too large to load into dicts.
+    
+    Each input is a CSV of product,quantity rows (quantities are parsed as
+    int, falling back to float). Inputs are read in runs of run_size rows;
+    each run is stably sorted in memory and spilled to a temporary file.
+    The runs are then k-way merged with a heap, at most
+    _CATALOG_MERGE_FANIN at a time. Only the final pass sums the
+    quantities of equal products. Both the sort and heapq.merge are
+    stable, so quantities are added in input order, exactly as
+    merge_catalogs adds them; this matters for floats. RAM use is bounded
+    by one run, and all I/O is sequential.
+    
+    The output holds the same products and quantities as merge_catalogs
+    applied to the inputs, sorted by product.
+    
+    Args:
+        paths: Paths of the input catalog CSV files
+        dst: Path of the merged catalog CSV
+        run_size: Number of input rows sorted in memory at a time (default 1000000)
+        tmpdir: Directory for run files (default: the system temp dir)
+        
+    Example:
+        merge_catalog_files(['supplier_a.csv', 'supplier_b.csv'], 'merged.csv')
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as workdir:
+        runs = []
+        for path in paths:
+            rows = _iter_catalog_csv(path)
+            while True:
+                run = sorted(islice(rows, run_size), key=itemgetter(0))
+                if not run:
+                    break
+                run_path = os.path.join(workdir, f'run-{len(runs)}.csv')
+                _write_catalog_csv(run, run_path)
+                runs.append(run_path)
+        
+        while len(runs) > _CATALOG_MERGE_FANIN:
+            merged = []
+            for start in range(0, len(runs), _CATALOG_MERGE_FANIN):
+                path = os.path.join(workdir, f'merge-{len(merged)}-{os.path.basename(runs[start])}')
+                sources = [_iter_catalog_csv(run) for run in runs[start:start + _CATALOG_MERGE_FANIN]]
+                _write_catalog_csv(heapq.merge(*sources, key=itemgetter(0)), path)
+                merged.append(path)
+            runs = merged
+        sources = [_iter_catalog_csv(run) for run in runs]
+        _write_catalog_csv(_iter_summed(heapq.merge(*sources, key=itemgetter(0))), dst)
+
+
+class CatalogStore:
+    """
+    Thread-safe product catalog, sharded by product hash.
+    
+    Each shard is a dict with its own lock, so merges and updates that touch
+    different shards do not wait for each other. merge() takes the locks of
+    every shard it touches, in ascending shard order so concurrent merges
+    cannot deadlock, and applies the whole catalog before releasing them;
+    snapshot() takes all of them the same way, so it never sees half a
+    merge. Quantities are summed exactly as in merge_catalogs. Locks are
+    held only for dict updates, so the store can also be shared with
+    asyncio tasks.
+    
+    Example:
+        store = CatalogStore()
+        store.merge({'apple': 5, 'banana': 3})
+        store.merge({'apple': 2, 'orange': 4})
+        store.apply_delta('banana', -1)
+        store.snapshot() -> {'apple': 7, 'banana': 2, 'orange': 4}
+    """
+    
+    def __init__(self, catalog: dict = None, shards: int = 64):
+        if shards < 1:
+            raise ValueError('shards must be at least 1')
+        self._shards = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        if catalog:
+            self.merge(catalog)
     
-    return complete_catalog
+    def _shard_index(self, product) -> int:
+        return hash(product) % len(self._shards)
+    
+    def merge(self, catalog: dict) -> None:
+        """Add every quantity in catalog to the store."""
+        parts = {}
+        for product, quantity in catalog.items():
+            parts.setdefault(self._shard_index(product), {})[product] = quantity
+        touched = sorted(parts)
+        for index in touched:
+            self._locks[index].acquire()
+        try:
+            for index in touched:
+                merge_catalogs_many(parts[index], into=self._shards[index])
+        finally:
+            for index in reversed(touched):
+                self._locks[index].release()
+    
+    def apply_delta(self, product, quantity) -> None:
+        """Add quantity (which may be negative) to one product."""
+        index = self._shard_index(product)
+        shard = self._shards[index]
+        with self._locks[index]:
+            if product in shard:
+                shard[product] += quantity
+            else:
+                shard[product] = quantity
+    
+    def get(self, product, default=None):
+        index = self._shard_index(product)
+        with self._locks[index]:
+            return self._shards[index].get(product, default)
+    
+    def __contains__(self, product) -> bool:
+        index = self._shard_index(product)
+        with self._locks[index]:
+            return product in self._shards[index]
+    
+    def __len__(self) -> int:
+        return len(self.snapshot())
+    
+    def snapshot(self) -> dict:
+        """Return a consistent copy of the whole catalog."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            merged = {}
+            for shard in self._shards:
+                merged.update(shard)
+            return merged
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+def _transpose_zip(matrix: list) -> list:
+    return [list(column) for column in zip(*matrix)]
+
+
+def _transpose_tiled(matrix: list, tile: int = 256) -> list:
+    """Transpose tile by tile so each block's rows and columns stay in cache."""
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows else 0
+    transposed = [[None] * rows for _ in range(cols)]
+    for i0 in range(0, rows, tile):
+        i1 = min(i0 + tile, rows)
+        band = matrix[i0:i1]
+        for j0 in range(0, cols, tile):
+            j1 = min(j0 + tile, cols)
+            for j, column in enumerate(zip(*[row[j0:j1] for row in band]), j0):
+                transposed[j][i0:i1] = column
+    return transposed
+
+
+def _transpose_numpy(matrix) -> list:
+    return np.asarray(matrix).T.tolist()
+
+
+# Below this many elements zip(*matrix) beats the tiled transpose.
+_TILED_TRANSPOSE_MIN = 1 << 22
+
+_TRANSPOSE_BACKENDS = {
+    'zip': _transpose_zip,
+    'tiled': _transpose_tiled,
+    'numpy': _transpose_numpy,
+}
+
 
-def transpose_matrix(matrix: list) -> list:
+def transpose_matrix(matrix: list, backend: str = 'auto') -> list:
     """
     Transpose a 2D matrix (swap rows and columns).
     
     Args:
-        matrix: 2D list (list of lists)
+        matrix: 2D list (list of lists); ragged rows raise ValueError
+        backend: 'zip' (pure Python, zip(*matrix)), 'tiled' (cache-blocked,
+            for very large matrices), 'numpy', or 'auto' (default): numpy
+            for NumPy array input, tiled for lists of 4M+ elements, zip
+            otherwise. Lists never go through NumPy automatically, because
+            converting them to an array and back costs more than zip does.
         
     Returns:
         Transposed matrix
@@ -60,16 +432,264 @@ def transpose_matrix(matrix: list) -> list:
         transpose_matrix([[1, 2, 3], [4, 5, 6]])
         -> [[1, 4], [2, 5], [3, 6]]
     """
-    transposed = []
-    for inner in range(len(matrix[0])):
-        temp = []
-        for i in range(len(matrix)):
-            temp.append(matrix[i][inner])
-        transposed.append(temp)
+    if not (np is not None and isinstance(matrix, np.ndarray)):
+        width = len(matrix[0]) if matrix else 0
+        if any(len(row) != width for row in matrix):
+            raise ValueError('every row of the matrix must have the same length')
+    if backend == 'auto':
+        if np is not None and isinstance(matrix, np.ndarray):
+            backend = 'numpy'
+        elif matrix and len(matrix) * len(matrix[0]) >= _TILED_TRANSPOSE_MIN:
+            backend = 'tiled'
+        else:
+            backend = 'zip'
+    try:
+        transpose = _TRANSPOSE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f'unknown transpose backend: {backend!r}') from None
+    if backend == 'numpy' and np is None:
+        raise ImportError("backend='numpy' requires NumPy")
+    return transpose(matrix)
+
+
+class _TransposedRow(Sequence):
+    """One row of a TransposedView, i.e. one column of the source matrix."""
+    
+    __slots__ = ('_matrix', '_column')
+    
+    def __init__(self, matrix: list, column: int):
+        self._matrix = matrix
+        self._column = column
+    
+    def __len__(self) -> int:
+        return len(self._matrix)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            column = self._column
+            return [row[column] for row in self._matrix[index]]
+        return self._matrix[index][self._column]
+    
+    def __iter__(self):
+        column = self._column
+        for row in self._matrix:
+            yield row[column]
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, tuple, _TransposedRow)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class TransposedView:
+    """
+    Lazy, zero-copy transpose of a row-major list of lists.
+    
+    view[i] is row i of the transpose (column i of the source) as a
+    lightweight sequence, and view[i, j] is matrix[j][i]. Nothing is copied
+    until materialize() is called.
+    
+    Example:
+        view = TransposedView([[1, 2, 3], [4, 5, 6]])
+        len(view) -> 3
+        view[2][1] -> 6
+        view.materialize() -> [[1, 4], [2, 5], [3, 6]]
+    """
+    
+    __slots__ = ('_matrix',)
+    
+    def __init__(self, matrix: list):
+        self._matrix = matrix
+    
+    @property
+    def shape(self) -> tuple:
+        """(rows, columns) of the transposed matrix."""
+        return len(self), len(self._matrix)
+    
+    def __len__(self) -> int:
+        return len(self._matrix[0]) if self._matrix else 0
+    
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            i, j = index
+            return self._matrix[j][i]
+        rows = range(len(self))
+        if isinstance(index, slice):
+            return [_TransposedRow(self._matrix, i) for i in rows[index]]
+        return _TransposedRow(self._matrix, rows[index])
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield _TransposedRow(self._matrix, i)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TransposedView):
+            other = other.materialize()
+        if not isinstance(other, list):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+    
+    def __repr__(self) -> str:
+        return f'TransposedView({self._matrix!r})'
+    
+    def materialize(self) -> list:
+        """Build the transposed matrix as a real list of lists."""
+        return transpose_matrix(self._matrix)
+
+
+def transpose_binary_file(src: str, dst: str, rows: int, cols: int,
+                          typecode: str = 'd', tile: int = 512) -> None:
+    """
+    Transpose a row-major binary matrix file into a column-major file.
+    
+    Both files hold fixed-width values of one array typecode in machine byte
+    order. The source is memory-mapped and read in tile x tile blocks, and
+    each block's columns are written as contiguous runs of the output, so
+    RAM use stays at one tile however large the matrix is.
+    
+    Args:
+        src: Path of the row-major input (rows * cols values)
+        dst: Path of the output; it holds the transpose in row-major order,
+            i.e. the input in column-major order
+        rows: Number of rows in the input
+        cols: Number of columns in the input
+        typecode: array typecode of the values (default 'd')
+        tile: Side of the square block processed at a time (default 512)
+        
+    Example:
+        transpose_binary_file('m.f64', 'mT.f64', rows=100000, cols=50000)
+    """
+    itemsize = array.array(typecode).itemsize
+    size = rows * cols * itemsize
+    if os.path.getsize(src) != size:
+        raise ValueError(f'{src!r} does not hold a {rows}x{cols} {typecode!r} matrix')
+    
+    with open(src, 'rb') as fin, open(dst, 'w+b') as fout:
+        fout.truncate(size)
+        if size == 0:
+            return
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as smap, \
+                mmap.mmap(fout.fileno(), 0) as dmap, \
+                memoryview(smap) as source, memoryview(dmap) as target:
+            for j0 in range(0, cols, tile):
+                width = min(tile, cols - j0)
+                for i0 in range(0, rows, tile):
+                    height = min(tile, rows - i0)
+                    block = array.array(typecode)
+                    for i in range(i0, i0 + height):
+                        start = (i * cols + j0) * itemsize
+                        block.frombytes(source[start:start + width * itemsize])
+                    for j in range(width):
+                        offset = ((j0 + j) * rows + i0) * itemsize
+                        with memoryview(block[j::width]) as column, column.cast('B') as data:
+                            target[offset:offset + height * itemsize] = data
+
+
+# Maximum number of spill files read side by side while merging a CSV transpose.
+_CSV_TRANSPOSE_FANIN = 128
+
+
+# Characters copied per read while streaming spilled CSV records.
+_CSV_COPY_BLOCK = 1 << 16
+
+
+def _copy_csv_record(file, out) -> bool:
+    """
+    Copy the next record of a '\n'-terminated CSV file to out, minus its terminator.
+    
+    The record is copied in blocks, so memory does not grow with its length.
+    A newline only ends the record outside quotes; quote parity is tracked
+    because csv doubles embedded quotes. Returns False at end of file.
+    """
+    quoted = False
+    piece = file.readline(_CSV_COPY_BLOCK)
+    if not piece:
+        return False
+    while piece:
+        quoted ^= piece.count('"') & 1
+        if piece.endswith('\n') and not quoted:
+            out.write(piece[:-1])
+            return True
+        out.write(piece)
+        piece = file.readline(_CSV_COPY_BLOCK)
+    return True
+
+
+def _concat_csv_columns(paths: list, dst: str, lineterminator: str = '\n') -> None:
+    """Write row k of dst as the concatenation of row k of every file in paths."""
+    files = [open(path, newline='\n') for path in paths]
+    try:
+        with open(dst, 'w', newline='') as out:
+            while _copy_csv_record(files[0], out):
+                for file in files[1:]:
+                    out.write(',')
+                    _copy_csv_record(file, out)
+                out.write(lineterminator)
+    finally:
+        for file in files:
+            file.close()
+
+
+def transpose_csv_file(src: str, dst: str, tile: int = 10000, tmpdir: str = None) -> None:
+    """
+    Transpose a CSV file too large to load as a list of lists.
+    
+    The input is streamed in bands of `tile` rows. Each band is transposed
+    in memory and spilled to a temporary CSV. The spills are then merged
+    side by side, at most _CSV_TRANSPOSE_FANIN at a time, into the output,
+    copying each record in fixed-size blocks. RAM use is bounded by one
+    band of the input, however many rows it has.
     
-    return transposed                
+    Args:
+        src: Path of the input CSV; every row must have the same length
+        dst: Path of the transposed output CSV
+        tile: Number of input rows transposed at a time (default 10000)
+        tmpdir: Directory for spill files (default: the system temp dir)
+        
+    Example:
+        transpose_csv_file('wide.csv', 'tall.csv', tile=50000)
+    """
+    with tempfile.TemporaryDirectory(dir=tmpdir) as workdir:
+        bands = []
+        width = None
+        with open(src, newline='') as file:
+            reader = csv.reader(file)
+            while True:
+                band = [row for _, row in zip(range(tile), reader)]
+                if not band:
+                    break
+                if width is None:
+                    width = len(band[0])
+                if any(len(row) != width for row in band):
+                    raise ValueError(f'{src!r} has rows of different lengths')
+                path = os.path.join(workdir, f'band-{len(bands)}.csv')
+                with open(path, 'w', newline='') as out:
+                    csv.writer(out, lineterminator='\n').writerows(zip(*band))
+                bands.append(path)
+        
+        while len(bands) > _CSV_TRANSPOSE_FANIN:
+            merged = []
+            for start in range(0, len(bands), _CSV_TRANSPOSE_FANIN):
+                path = os.path.join(workdir, f'merge-{len(merged)}-{os.path.basename(bands[start])}')
+                _concat_csv_columns(bands[start:start + _CSV_TRANSPOSE_FANIN], path)
+                merged.append(path)
+            bands = merged
+        _concat_csv_columns(bands, dst, '\r\n')
+
+
+# Weights of the (assignments average, midterm, final) parts of a grade.
+_DEFAULT_GRADE_WEIGHTS = (0.4, 0.3, 0.3)
+
 
-def calculate_final_grades(students: dict) -> dict:
+def _weighted_grade(average: float, midterm: float, final: float, weights: tuple) -> float:
+    """The final-grade formula shared by every grade API."""
+    return (midterm * weights[1]) + (final * weights[2]) + average * weights[0]
+
+
+def calculate_final_grades(students: dict, weights: tuple = _DEFAULT_GRADE_WEIGHTS) -> dict:
     """
     Calculate final grades based on weighted scores.
     
@@ -81,6 +701,7 @@ def calculate_final_grades(students: dict) -> dict:
                 'final': score            # 30% of grade
             }
         }
+        weights: (assignments, midterm, final) weights (default (0.4, 0.3, 0.3))
         
     Returns:
         {'name': final_grade} where final_grade is weighted average
@@ -92,136 +713,1719 @@ def calculate_final_grades(students: dict) -> dict:
         -> {'Alice': 88.0}
     """
     final = {}
-    for key in students.keys():
-        assignments = (sum(students[key]['assignments']) / len(students[key]['assignments'])) * 0.4
-        final_marks = (students[key]['midterm'] * 0.3) + (students[key]['final'] * 0.3) + assignments
-        final.update({key: final_marks})
+    for name, record in students.items():
+        scores = record['assignments']
+        final[name] = _weighted_grade(sum(scores) / len(scores), record['midterm'], record['final'], weights)
         
     return final
 
 
-def word_frequency(text: str, top_n: int = 5) -> list:
+def students_to_columns(students: dict) -> tuple:
     """
-    Find the top N most frequent words in text (case-insensitive).
-    Ignore punctuation.
+    Convert calculate_final_grades input into calculate_final_grades_columnar input.
     
     Args:
-        text: Input text string
-        top_n: Number of top words to return (default 5)
+        students: Same shape as for calculate_final_grades
         
     Returns:
-        List of tuples (word, count) sorted by count (descending)
+        (names, midterms, finals, scores, offsets): names as a list, the
+        scores as array('d') columns, and the assignment scores of student i
+        at scores[offsets[i]:offsets[i + 1]]
         
     Example:
-        word_frequency("The cat and the dog. The cat!", 2)
-        -> [('the', 3), ('cat', 2)]
+        students_to_columns({'Alice': {'assignments': [80, 90], 'midterm': 88, 'final': 92}})
+        -> (['Alice'], array('d', [88.0]), array('d', [92.0]),
+            array('d', [80.0, 90.0]), array('q', [0, 2]))
+    """
+    names = list(students)
+    records = list(students.values())
+    midterms = array.array('d', map(itemgetter('midterm'), records))
+    finals = array.array('d', map(itemgetter('final'), records))
+    scores = array.array('d')
+    offsets = array.array('q', [0])
+    for record in records:
+        scores.fromlist(list(record['assignments']))
+        offsets.append(len(scores))
+    return names, midterms, finals, scores, offsets
+
+
+def calculate_final_grades_columnar(names: list, midterms, finals, scores, offsets,
+                                    weights: tuple = _DEFAULT_GRADE_WEIGHTS) -> dict:
     """
- 
-    usable = []
-    for word in text.lower().split():
-        temp_str = "".join([i for i in word if i.isalnum()])
-        if temp_str != "":
-            usable.append(temp_str)
+    Columnar form of calculate_final_grades for very large classes.
     
-    d = {i: usable.count(i) for i in usable}
-  
-    x = dict(sorted(d.items(), key=lambda item:item[1], reverse=True))
+    All grades are computed in one vectorized pass: with NumPy when it is
+    available, otherwise with C-level map() pipelines over the columns.
+    Without NumPy the gain is mostly memory, since array columns replace a
+    dict and a list per student.
     
-    return x[:top_n]
+    Args:
+        names: Student names, in output order
+        midterms: Midterm score per student (any sequence or buffer)
+        finals: Final exam score per student
+        scores: All assignment scores back to back
+        offsets: len(names) + 1 increasing offsets; student i's assignment
+            scores are scores[offsets[i]:offsets[i + 1]]
+        weights: (assignments, midterm, final) weights (default (0.4, 0.3, 0.3))
+        
+    Returns:
+        {'name': final_grade}, in the order of names
+        
+    Example:
+        calculate_final_grades_columnar(['Alice'], [88], [92], [80, 90, 85], [0, 3])
+        -> {'Alice': 88.0}
+    """
+    if len(offsets) != len(names) + 1:
+        raise ValueError('offsets must hold one more entry than names')
+    w_assignments, w_midterm, w_final = weights
     
+    if np is not None:
+        offsets = np.asarray(offsets, dtype=np.intp)
+        counts = np.diff(offsets)
+        if (counts <= 0).any():
+            raise ZeroDivisionError('every student needs at least one assignment score')
+        scores = np.asarray(scores, dtype=float)
+        # reduceat sums the last segment to the end, so stop at offsets[-1].
+        sums = np.add.reduceat(scores[:offsets[-1]], offsets[:-1]) if len(names) else np.zeros(0)
+        grades = ((np.asarray(midterms, dtype=float) * w_midterm)
+                  + (np.asarray(finals, dtype=float) * w_final)
+                  + (sums / counts) * w_assignments)
+        return dict(zip(names, grades.tolist()))
     
+    counts = list(map(sub, offsets[1:], offsets[:-1]))
+    # Every islice draws the next student's scores from one shared iterator.
+    remaining = islice(scores, offsets[0], None)
+    sums = map(sum, map(islice, repeat(remaining), counts))
+    averages = map(truediv, sums, counts)
+    grades = map(add,
+                 map(add, map(mul, midterms, repeat(w_midterm)), map(mul, finals, repeat(w_final))),
+                 map(mul, averages, repeat(w_assignments)))
+    return dict(zip(names, grades))
 
-def remove_duplicates_preserve_order(items: list) -> list:
+
+class _StudentScores:
+    """Running assignment totals and exam scores for one Gradebook student."""
+    
+    __slots__ = ('scores', 'total', 'next_id', 'midterm', 'final')
+    
+    def __init__(self, midterm: float, final: float):
+        self.scores = {}
+        self.total = 0
+        self.next_id = 0
+        self.midterm = midterm
+        self.final = final
+
+
+class Gradebook:
     """
-    Remove duplicates from list while preserving original order.
+    Incrementally maintained final grades.
+    
+    Each student keeps a running sum and count of assignment scores, so
+    adding, editing or removing one score, or changing an exam score,
+    recomputes only that student's grade in O(1). Assignment scores are
+    addressed by the id returned from add_score(); scores passed in a list
+    get ids 0, 1, 2, ... in list order. A student with no assignment scores
+    gets 0 for the assignments part.
+    
+    Example:
+        book = Gradebook.from_students({
+            'Alice': {'assignments': [80, 90, 85], 'midterm': 88, 'final': 92}
+        })
+        book.snapshot() -> {'Alice': 88.0}
+        book.set_score('Alice', 0, 95)
+        book.snapshot() -> {'Alice': 90.0}
+    """
+    
+    def __init__(self, weights: tuple = _DEFAULT_GRADE_WEIGHTS):
+        self.weights = weights
+        self._students = {}
+        self._grades = {}
+    
+    @classmethod
+    def from_students(cls, students: dict, weights: tuple = _DEFAULT_GRADE_WEIGHTS) -> 'Gradebook':
+        """Build a gradebook from calculate_final_grades-style input."""
+        book = cls(weights)
+        book.update(students)
+        return book
+    
+    def __len__(self) -> int:
+        return len(self._students)
+    
+    def __contains__(self, name) -> bool:
+        return name in self._students
+    
+    def _refresh(self, name: str, student: _StudentScores) -> None:
+        count = len(student.scores)
+        average = student.total / count if count else 0
+        self._grades[name] = _weighted_grade(average, student.midterm, student.final, self.weights)
+    
+    def add_student(self, name: str, assignments=(), midterm: float = 0, final: float = 0) -> None:
+        """Add a student, replacing any existing student of that name."""
+        student = _StudentScores(midterm, final)
+        for score in assignments:
+            student.scores[student.next_id] = score
+            student.total += score
+            student.next_id += 1
+        self._students[name] = student
+        self._refresh(name, student)
+    
+    def remove_student(self, name: str) -> None:
+        del self._students[name]
+        del self._grades[name]
+    
+    def add_score(self, name: str, score: float) -> int:
+        """Add an assignment score and return its id."""
+        student = self._students[name]
+        score_id = student.next_id
+        student.next_id += 1
+        student.scores[score_id] = score
+        student.total += score
+        self._refresh(name, student)
+        return score_id
+    
+    def set_score(self, name: str, score_id: int, score: float) -> None:
+        """Replace the assignment score with the given id."""
+        student = self._students[name]
+        student.total += score - student.scores[score_id]
+        student.scores[score_id] = score
+        self._refresh(name, student)
+    
+    def remove_score(self, name: str, score_id: int) -> None:
+        """Remove the assignment score with the given id."""
+        student = self._students[name]
+        student.total -= student.scores.pop(score_id)
+        self._refresh(name, student)
+    
+    def set_exams(self, name: str, midterm: float = None, final: float = None) -> None:
+        """Change a student's midterm and/or final exam score."""
+        student = self._students[name]
+        if midterm is not None:
+            student.midterm = midterm
+        if final is not None:
+            student.final = final
+        self._refresh(name, student)
+    
+    def update(self, students: dict) -> None:
+        """Add or replace several students from calculate_final_grades-style input."""
+        for name, record in students.items():
+            self.add_student(name, record['assignments'], record['midterm'], record['final'])
+    
+    def grade(self, name: str) -> float:
+        return self._grades[name]
+    
+    def snapshot(self) -> dict:
+        """Return {'name': final_grade} for every student, in insertion order."""
+        return dict(self._grades)
+
+
+def _grade_format(path, fmt: str = None) -> str:
+    """Return 'csv' or 'jsonl' for path, from fmt or the file extension."""
+    if fmt is None:
+        fmt = os.path.splitext(os.fspath(path))[1].lstrip('.').lower()
+        fmt = {'ndjson': 'jsonl'}.get(fmt, fmt)
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f'unsupported grade file format: {fmt!r}')
+    return fmt
+
+
+def _grade_chunk(task: tuple) -> list:
+    """
+    Pool task: compute [(name, final_grade)] for one chunk of records.
+    
+    JSONL chunks are raw lines; CSV chunks are rows already split by the
+    csv module, with the header naming the name, midterm and final columns.
+    Every other CSV column holds an assignment score; blank cells are skipped.
+    """
+    fmt, header, rows, weights = task
+    grades = []
+    if fmt == 'jsonl':
+        for line in rows:
+            record = json.loads(line)
+            scores = record['assignments']
+            grades.append((record['name'], _weighted_grade(
+                sum(scores) / len(scores), record['midterm'], record['final'], weights)))
+        return grades
+    
+    name_at, midterm_at, final_at = (header.index(column) for column in ('name', 'midterm', 'final'))
+    score_columns = [i for i in range(len(header)) if i not in (name_at, midterm_at, final_at)]
+    for row in rows:
+        scores = [float(row[i]) for i in score_columns if i < len(row) and row[i].strip()]
+        grades.append((row[name_at], _weighted_grade(
+            sum(scores) / len(scores), float(row[midterm_at]), float(row[final_at]), weights)))
+    return grades
+
+
+def _iter_grade_tasks(path, fmt: str, chunk_size: int, weights: tuple):
+    """Read path lazily and yield one _grade_chunk task per chunk_size records."""
+    with open(path, newline='', encoding='utf-8') as file:
+        if fmt == 'csv':
+            reader = csv.reader(file)
+            header = [column.strip() for column in next(reader, [])]
+            records = (row for row in reader if row)
+        else:
+            header = None
+            records = (line for line in file if line.strip())
+        while True:
+            rows = list(islice(records, chunk_size))
+            if not rows:
+                return
+            yield fmt, header, rows, weights
+
+
+def iter_final_grades_file(path, fmt: str = None, chunk_size: int = 10000, workers: int = None,
+                           weights: tuple = _DEFAULT_GRADE_WEIGHTS):
+    """
+    Stream final grades from a large CSV or JSONL export.
+    
+    Records are read in chunks and graded in a process pool with the same
+    formula as calculate_final_grades. At most two chunks per worker are in
+    flight at once, so peak memory is bounded by chunk_size, and results
+    come back in file order.
+    
+    JSONL lines are objects shaped like one calculate_final_grades entry
+    plus its name: {"name": ..., "assignments": [...], "midterm": ...,
+    "final": ...}. CSV files need name, midterm and final columns; every
+    other column is an assignment score, and blank cells are skipped.
     
     Args:
-        items: List with potential duplicates
+        path: Input file
+        fmt: 'csv' or 'jsonl' (default: from the extension; .ndjson is JSONL,
+            while .json is rejected since it usually holds one document)
+        chunk_size: Records per chunk (default 10000)
+        workers: Worker processes (default: all cores); 1 grades in-process
+        weights: (assignments, midterm, final) weights (default (0.4, 0.3, 0.3))
         
-    Returns:
-        List with duplicates removed, original order maintained
+    Yields:
+        (name, final_grade) tuples in file order
         
     Example:
-        remove_duplicates_preserve_order([1, 2, 2, 3, 1, 4])
-        -> [1, 2, 3, 4]
+        dict(iter_final_grades_file('grades.jsonl', workers=8))
+        -> {'Alice': 88.0, ...}
     """
-    res = []
-    for i in items:
-        if i not in res:
-            res.append(i)
+    fmt = _grade_format(path, fmt)
+    tasks = _iter_grade_tasks(path, fmt, chunk_size, weights)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for task in tasks:
+            yield from _grade_chunk(task)
+        return
     
-    return res
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_grade_chunk, task))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
-def validate_password(password: str) -> bool:
+
+def write_final_grades_file(src, dst, fmt: str = None, chunk_size: int = 10000, workers: int = None,
+                            weights: tuple = _DEFAULT_GRADE_WEIGHTS) -> int:
     """
-    Validate password meets all requirements:
-    - At least 8 characters long
-    - Contains at least one uppercase letter
-    - Contains at least one lowercase letter
-    - Contains at least one digit
-    - Contains at least one special character (!@#$%^&*)
+    Grade a CSV or JSONL export and write the results incrementally.
     
     Args:
-        password: String to validate
+        src: Input file, as for iter_final_grades_file
+        dst: Output file; a .csv extension writes name,final_grade rows,
+            anything else writes JSONL {"name": ..., "final_grade": ...}
+        fmt, chunk_size, workers, weights: As for iter_final_grades_file
         
     Returns:
-        True if valid, False otherwise
+        Number of students written
         
     Example:
-        validate_password("Secure123!") -> True
-        validate_password("weak") -> False
+        write_final_grades_file('grades.csv', 'final.csv', workers=16) -> 1000000
     """
-    pass
+    grades = iter_final_grades_file(src, fmt, chunk_size, workers, weights)
+    written = 0
+    with open(dst, 'w', newline='', encoding='utf-8') as out:
+        if os.fspath(dst).lower().endswith('.csv'):
+            writer = csv.writer(out)
+            writer.writerow(['name', 'final_grade'])
+            for row in grades:
+                writer.writerow(row)
+                written += 1
+        else:
+            for name, grade in grades:
+                out.write(json.dumps({'name': name, 'final_grade': grade}) + '\n')
+                written += 1
+    return written
+
+
+# Characters that are neither alphanumeric nor whitespace; re's \w and \s use
+# the same Unicode tables as str.isalnum() and str.split().
+_NON_WORD_CHARS = re.compile(r'[^\w\s]|_')
+# Bytes-mode equivalents for pure-ASCII chunks. bytes.split() does not treat
+# \x1c-\x1f as whitespace, so those are mapped to spaces first.
+_BYTES_SEPARATORS = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')
+_BYTES_NON_WORD = bytes(c for c in range(128) if not (chr(c).isalnum() or chr(c).isspace()))
+# Encodings in which ASCII bytes always stand for themselves.
+_ASCII_COMPATIBLE_ENCODINGS = {'ascii', 'utf-8', 'iso8859-1'}
+_TOKEN_CHUNK_SIZE = 1 << 20
+
+# Single-byte separators for str.split(); they never occur inside a UTF-8
+# multi-byte sequence, so splitting a buffer on them is always safe.
+_WHITESPACE_BYTES = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+_WHITESPACE_BYTE = re.compile(rb'[ \t\n\r\x0b\x0c\x1c-\x1f]')
 
-def generate_primes(limit: int) -> list:
+
+def _split_on_whitespace(buf, parts: int) -> list:
+    """Cut buf into about `parts` (start, stop) ranges ending on whitespace."""
+    size = len(buf)
+    bounds = []
+    start = 0
+    for i in range(1, parts + 1):
+        if start >= size:
+            break
+        stop = size if i == parts else max(start, size * i // parts)
+        if stop < size:
+            match = _WHITESPACE_BYTE.search(buf, stop)
+            stop = match.end() if match else size
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    return codecs.lookup(encoding).name in _ASCII_COMPATIBLE_ENCODINGS
+
+
+def _iter_byte_chunks(data):
+    """Yield bytes chunks of a bytes-like object, each cut at whitespace."""
+    with memoryview(data) as view, view.cast('B') as flat:
+        parts = max(1, len(flat) // _TOKEN_CHUNK_SIZE)
+        for start, stop in _split_on_whitespace(flat, parts):
+            yield flat[start:stop].tobytes()
+
+
+def tokenize(text, encoding: str = 'utf-8') -> list:
     """
-    Generate all prime numbers up to (but not including) limit.
+    Split text into the words counted by word_frequency.
+    
+    Text is lowercased, split on whitespace, and every character that is not
+    alphanumeric is dropped from each word; words left empty are skipped.
+    Pure-ASCII text is cleaned with bytes.translate and everything else with
+    one precompiled regex. Bytes-like input is processed in chunks, and
+    pure-ASCII chunks are cleaned without decoding them first.
     
     Args:
-        limit: Upper bound (exclusive)
+        text: A str, or bytes-like data (bytes, bytearray, memoryview, mmap)
+        encoding: Encoding of bytes-like input (default utf-8)
         
     Returns:
-        List of prime numbers
+        List of words (str)
         
     Example:
-        generate_primes(20) -> [2, 3, 5, 7, 11, 13, 17, 19]
+        tokenize("Hello, World! it's") -> ['hello', 'world', 'its']
     """
-    def is_prime(n: int) -> bool:
-        if n <= 1:
-            return False
-        
-        if n == 2:
-            return True
-        
-        for i in range(2, n):
-            if n % i == 0:
-                return False 
-        return True
-    
-    primes = []
-    for i in range(limit):
-        if is_prime(i):
-            primes.append(i)
-    
-    return primes
+    if isinstance(text, str):
+        text = text.lower()
+        if text.isascii():
+            cleaned = text.encode('ascii').translate(_BYTES_SEPARATORS, _BYTES_NON_WORD)
+            return cleaned.decode('ascii').split()
+        return _NON_WORD_CHARS.sub('', text).split()
+    if not _is_ascii_compatible(encoding):
+        return tokenize(bytes(text).decode(encoding))
+    tokens = []
+    for chunk in _iter_byte_chunks(text):
+        if chunk.isascii():
+            cleaned = chunk.lower().translate(_BYTES_SEPARATORS, _BYTES_NON_WORD)
+            tokens.extend(cleaned.decode('ascii').split())
+        else:
+            tokens.extend(tokenize(chunk.decode(encoding)))
+    return tokens
 
-def binary_search(sorted_list: list, target: int) -> int:
+
+def count_words(text, counts: Counter = None, encoding: str = 'utf-8') -> Counter:
     """
-    Implement binary search to find target in sorted list.
+    Add the words of text, as tokenized by tokenize(), to a Counter.
+    
+    For bytes-like input, pure-ASCII chunks are counted as bytes words and
+    only the distinct words are decoded at the end.
     
     Args:
-        sorted_list: Sorted list of integers
-        target: Value to find
+        text: A str, or bytes-like data (bytes, bytearray, memoryview, mmap)
+        counts: Counter to add to (default: a new one)
+        encoding: Encoding of bytes-like input (default utf-8)
         
     Returns:
-        Index of target if found, -1 otherwise
+        The updated Counter, with words in first-seen order
         
     Example:
-        binary_search([1, 3, 5, 7, 9], 5) -> 2
-        binary_search([1, 3, 5, 7, 9], 4) -> -1
+        count_words(b"the cat, the dog") -> Counter({'the': 2, 'cat': 1, 'dog': 1})
     """
-    l = 0
-    r = len(sorted_list)
+    if counts is None:
+        counts = Counter()
+    if isinstance(text, str) or not _is_ascii_compatible(encoding):
+        counts.update(tokenize(text, encoding))
+        return counts
+    raw = Counter()
+    for chunk in _iter_byte_chunks(text):
+        if chunk.isascii():
+            raw.update(chunk.lower().translate(_BYTES_SEPARATORS, _BYTES_NON_WORD).split())
+        else:
+            raw.update(tokenize(chunk.decode(encoding)))
+    for word, count in raw.items():
+        if isinstance(word, bytes):
+            word = word.decode('ascii')
+        counts[word] += count
+    return counts
+
+
+def _top_words(counts: Counter, top_n: int) -> list:
+    """Pick the top_n (word, count) pairs; ties keep first-seen order."""
+    return heapq.nlargest(top_n, counts.items(), key=itemgetter(1))
+
+
+def _iter_text_chunks(file, chunk_size: int, encoding: str = None):
+    """
+    Read str chunks that never end in the middle of a word.
+    
+    file is a text-mode file, or a binary one when encoding is given.
+    """
+    decode = codecs.getincrementaldecoder(encoding)().decode if encoding else None
+    carry = ''
+    while True:
+        data = file.read(chunk_size)
+        piece = carry + (decode(data, final=not data) if decode else data)
+        if not data:
+            if piece:
+                yield piece
+            return
+        cut = len(piece)
+        while cut and not piece[cut - 1].isspace():
+            cut -= 1
+        if cut:
+            yield piece[:cut]
+            carry = piece[cut:]
+        else:
+            carry = piece
+
+
+def _iter_binary_chunks(file, chunk_size: int):
+    """Read a binary file in chunks that end on an ASCII whitespace byte."""
+    carry = b''
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            if carry:
+                yield carry
+            return
+        data = carry + data
+        cut = max(data.rfind(byte) for byte in _WHITESPACE_BYTES) + 1
+        if cut:
+            yield data[:cut]
+        carry = data[cut:]
+
+
+def _iter_text_source(source, encoding: str = 'utf-8', chunk_size: int = 1 << 20):
+    """
+    Yield str or bytes pieces from a path, file object or iterable of lines.
+    
+    Words never straddle two pieces, so each piece can be tokenized on its
+    own. Binary input in an ASCII-compatible encoding is passed on as bytes
+    for the tokenizer's bytes fast path; text-mode files are read as str.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from _iter_text_source(file, encoding, chunk_size)
+    elif hasattr(source, 'read'):
+        if isinstance(source.read(0), str):
+            yield from _iter_text_chunks(source, chunk_size)
+        elif _is_ascii_compatible(encoding):
+            yield from _iter_binary_chunks(source, chunk_size)
+        else:
+            yield from _iter_text_chunks(source, chunk_size, encoding)
+    else:
+        yield from source
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters counter over a fixed number of slots.
+    
+    At most `capacity` words are tracked. When a new word arrives and every
+    slot is taken, a word with the smallest count is evicted and the newcomer
+    inherits that count plus one, recording it as its error. Every reported
+    count over-estimates the true count by at most its error, and any word
+    seen more than total / capacity times is guaranteed to be tracked.
+    
+    Words are grouped into buckets by count so that each update is O(1).
+    
+    Example:
+        sketch = SpaceSaving(2)
+        sketch.update(['a', 'b', 'a', 'c'])
+        sketch.top(1) -> [('a', 2, 0)]
+    """
+    
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # count -> insertion-ordered set (dict with None values) of words
+        self._buckets = {}
+        self._min = 0
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def add(self, word) -> None:
+        """Record one occurrence of word."""
+        self.total += 1
+        counts = self._counts
+        buckets = self._buckets
+        count = counts.get(word)
+        if count is None:
+            if len(counts) < self.capacity:
+                count = 0
+                self._errors[word] = 0
+                self._min = 1
+            else:
+                count = self._min
+                bucket = buckets[count]
+                victim = next(iter(bucket))
+                del bucket[victim]
+                if not bucket:
+                    del buckets[count]
+                    self._min = count + 1
+                del counts[victim]
+                del self._errors[victim]
+                self._errors[word] = count
+        else:
+            bucket = buckets[count]
+            del bucket[word]
+            if not bucket:
+                del buckets[count]
+                if self._min == count:
+                    self._min = count + 1
+        counts[word] = count + 1
+        bucket = buckets.get(count + 1)
+        if bucket is None:
+            buckets[count + 1] = {word: None}
+        else:
+            bucket[word] = None
+    
+    def update(self, words) -> None:
+        """Record one occurrence of every word in an iterable."""
+        add = self.add
+        for word in words:
+            add(word)
+    
+    def top(self, n: int) -> list:
+        """Return up to n (word, count, error) triples, highest count first."""
+        errors = self._errors
+        return [(word, count, errors[word])
+                for word, count in heapq.nlargest(n, self._counts.items(), key=itemgetter(1))]
+
+
+def _approx_capacity(top_n: int, capacity: int) -> int:
+    """Number of Space-Saving slots for an approximate query."""
+    if capacity is not None:
+        return capacity
+    return max(100 * top_n, 10000)
+
+
+def word_frequency(text: str, top_n: int = 5, approx: bool = False,
+                   capacity: int = None) -> list:
+    """
+    Find the top N most frequent words in text (case-insensitive).
+    Ignore punctuation.
+    
+    Args:
+        text: Input text string
+        top_n: Number of top words to return (default 5)
+        approx: Count with a fixed-size SpaceSaving sketch instead of an
+            exact counter (default False)
+        capacity: Number of words the sketch tracks when approx is set
+            (default max(100 * top_n, 10000))
+        
+    Returns:
+        List of tuples (word, count) sorted by count (descending). With
+        approx set, tuples are (word, count, error) and the true count lies
+        in [count - error, count].
+        
+    Example:
+        word_frequency("The cat and the dog. The cat!", 2)
+        -> [('the', 3), ('cat', 2)]
+    """
+    if approx:
+        sketch = SpaceSaving(_approx_capacity(top_n, capacity))
+        sketch.update(tokenize(text))
+        return sketch.top(top_n)
+    return _top_words(count_words(text), top_n)
+
+
+def word_frequency_stream(source, top_n: int = 5, encoding: str = 'utf-8',
+                          approx: bool = False, capacity: int = None) -> list:
+    """
+    Streaming form of word_frequency for inputs too large to hold as one str.
+    
+    The input is read and tokenized piece by piece into a counter, so memory
+    is bounded by the vocabulary rather than by the size of the input. With
+    approx set, memory is fixed by capacity instead.
+    
+    Args:
+        source: A file path, a binary or text-mode file object, or an
+            iterable of lines (str or bytes)
+        top_n: Number of top words to return (default 5)
+        encoding: Encoding used to decode bytes input (default utf-8)
+        approx: Count with a fixed-size SpaceSaving sketch (default False)
+        capacity: Number of words the sketch tracks when approx is set
+        
+    Returns:
+        List of tuples (word, count) sorted by count (descending), or
+        (word, count, error) tuples when approx is set
+        
+    Example:
+        word_frequency_stream('server.log', 3)
+        -> [('get', 91234), ('200', 88012), ('http', 87655)]
+    """
+    if approx:
+        sketch = SpaceSaving(_approx_capacity(top_n, capacity))
+        for piece in _iter_text_source(source, encoding):
+            sketch.update(tokenize(piece, encoding))
+        return sketch.top(top_n)
+    counts = Counter()
+    for piece in _iter_text_source(source, encoding):
+        count_words(piece, counts, encoding)
+    return _top_words(counts, top_n)
+
+
+def _count_words_in_file_range(task: tuple) -> Counter:
+    """Pool task: count the words of path[start:stop]."""
+    path, start, stop, encoding = task
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        with memoryview(buf) as view:
+            return count_words(view[start:stop], encoding=encoding)
+
+
+def _count_words_in_bytes(task: tuple) -> Counter:
+    """Pool task: count the words of an in-memory chunk."""
+    data, encoding = task
+    return count_words(data, encoding=encoding)
+
+
+# Largest chunk of an in-memory buffer copied to a pool worker at once.
+_PARALLEL_BUFFER_CHUNK = 16 << 20
+
+
+def _merge_partial_counts(counts: Counter, count_chunk, tasks, workers: int) -> None:
+    """
+    Run count_chunk over tasks and fold the partial counts in task order.
+    
+    Tasks are consumed lazily and at most two per worker are in flight, so
+    tasks that carry data only exist a few at a time.
+    """
+    if workers <= 1:
+        for task in tasks:
+            counts.update(count_chunk(task))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(count_chunk, task))
+            if len(pending) >= 2 * workers:
+                counts.update(pending.popleft().result())
+        while pending:
+            counts.update(pending.popleft().result())
+
+
+def word_frequency_parallel(source, top_n: int = 5, workers: int = None,
+                            encoding: str = 'utf-8') -> list:
+    """
+    Map-reduce form of word_frequency that counts chunks in a process pool.
+    
+    The input is cut at whitespace into a few chunks per worker. Each chunk is
+    counted in a worker process, and the partial counts are merged in input
+    order, so results, including the order of ties, match word_frequency.
+    
+    Args:
+        source: A file path (memory-mapped by each worker) or a bytes-like
+            buffer such as bytes or mmap; buffers are sent to the workers
+            in chunks of at most _PARALLEL_BUFFER_CHUNK bytes, a few at a
+            time, so pass the path of a file-backed mmap to avoid copies
+        top_n: Number of top words to return (default 5)
+        workers: Number of worker processes (default: all cores); 1 counts
+            in the calling process
+        encoding: ASCII-compatible encoding of the input (default utf-8);
+            others, such as utf-16, raise ValueError
+        
+    Returns:
+        List of tuples (word, count) sorted by count (descending)
+        
+    Example:
+        word_frequency_parallel('corpus.txt', 3, workers=16)
+        -> [('the', 1204332), ('of', 700112), ('and', 611908)]
+    """
+    if not _is_ascii_compatible(encoding):
+        # Chunks are cut at single whitespace bytes, which is only safe here.
+        raise ValueError(f'word_frequency_parallel needs an ASCII-compatible encoding, not {encoding!r}')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    counts = Counter()
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.getsize(source) == 0:
+            return []
+        with open(source, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            bounds = _split_on_whitespace(buf, 4 * workers)
+        _merge_partial_counts(counts, _count_words_in_file_range,
+                              [(source, start, stop, encoding) for start, stop in bounds],
+                              workers if len(bounds) > 1 else 1)
+    else:
+        with memoryview(source) as view, view.cast('B') as data:
+            parts = max(4 * workers, -(-len(data) // _PARALLEL_BUFFER_CHUNK))
+            bounds = _split_on_whitespace(data, parts)
+            if len(bounds) <= 1:
+                workers = 1
+            # Pool tasks are pickled, so they carry copies, made lazily and
+            # bounded in size; in-process ones slice the view.
+            wrap = memoryview if workers <= 1 else bytes
+            tasks = ((wrap(data[start:stop]), encoding) for start, stop in bounds)
+            _merge_partial_counts(counts, _count_words_in_bytes, tasks, workers)
+    return _top_words(counts, top_n)
+
+
+class WordFrequencyIndex:
+    """
+    Incrementally maintained word counts over a changing set of documents.
+    
+    Documents are tokenized exactly like word_frequency. Adding or removing
+    a document only touches that document's words; the top-N ranking is
+    recomputed lazily, on the first top() call after a change.
+    
+    Ties are ranked in the order words entered the index, so an index built
+    only with add() ranks exactly like word_frequency over the concatenation.
+    
+    Example:
+        index = WordFrequencyIndex()
+        index.add("The cat and the dog.")
+        index.add("The cat!")
+        index.top(2) -> [('the', 3), ('cat', 2)]
+        index.remove("The cat!")
+        index.top(1) -> [('the', 2)]
+    """
+    
+    _FORMAT_VERSION = 1
+    # Rank at least this many words per rebuild so small top() calls share it.
+    _MIN_RANKING = 64
+    
+    def __init__(self, counts: dict = None):
+        self._counts = Counter()
+        if counts:
+            self._counts.update(counts)
+        self._ranking = None
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def __contains__(self, word) -> bool:
+        return word in self._counts
+    
+    def count(self, word: str) -> int:
+        """Return how many times word occurs across the indexed documents."""
+        return self._counts.get(word, 0)
+    
+    def add(self, text: str) -> None:
+        """Add one document's words to the index."""
+        self._counts.update(tokenize(text))
+        self._ranking = None
+    
+    def remove(self, text: str) -> None:
+        """
+        Remove a previously added document's words from the index.
+        
+        Raises ValueError, leaving the index unchanged, if the document
+        holds a word more often than the index does.
+        """
+        delta = Counter(tokenize(text))
+        counts = self._counts
+        for word, count in delta.items():
+            if counts.get(word, 0) < count:
+                raise ValueError(f'{word!r} is not indexed {count} times')
+        for word, count in delta.items():
+            if counts[word] == count:
+                del counts[word]
+            else:
+                counts[word] -= count
+        self._ranking = None
+    
+    def top(self, n: int = 5) -> list:
+        """Return the n most frequent (word, count) pairs."""
+        ranking = self._ranking
+        if ranking is None or (len(ranking) < n and len(ranking) < len(self._counts)):
+            ranking = self._ranking = _top_words(self._counts, max(n, self._MIN_RANKING))
+        return ranking[:n]
+    
+    def save(self, path) -> None:
+        """Write the index to path as JSON."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'version': self._FORMAT_VERSION, 'counts': list(self._counts.items())}, file)
+    
+    @classmethod
+    def load(cls, path) -> 'WordFrequencyIndex':
+        """Read an index written by save()."""
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        if data.get('version') != cls._FORMAT_VERSION:
+            raise ValueError(f'unsupported index format: {data.get("version")!r}')
+        return cls(dict(data['counts']))
+
+
+# Type tags that keep frozen lists and dicts from colliding with real tuples.
+_LIST_KEY = object()
+_DICT_KEY = object()
+
+
+def _freeze(item):
+    """
+    Build a hashable stand-in for an unhashable item.
+    
+    Lists, tuples, dicts, sets and bytearrays are converted recursively, so
+    two items get equal stand-ins exactly when they compare equal. Raises
+    TypeError for other unhashable types.
+    """
+    if isinstance(item, list):
+        return (_LIST_KEY, tuple(_hashable_key(i) for i in item))
+    if isinstance(item, tuple):
+        return tuple(_hashable_key(i) for i in item)
+    if isinstance(item, dict):
+        return (_DICT_KEY, frozenset((k, _hashable_key(v)) for k, v in item.items()))
+    if isinstance(item, set):
+        return frozenset(item)
+    if isinstance(item, bytearray):
+        return bytes(item)
+    raise TypeError(f'unhashable type: {type(item).__name__!r}')
+
+
+def _hashable_key(item):
+    """Return item itself if it is hashable, otherwise its frozen stand-in."""
+    try:
+        hash(item)
+    except TypeError:
+        return _freeze(item)
+    return item
+
+
+def iter_unique(iterable, key=None):
+    """
+    Lazily yield the first occurrence of each distinct item.
+    
+    Items are tracked in a set, so each one costs O(1). Unhashable items
+    (lists, dicts, sets) are tracked through a frozen copy; anything that
+    cannot be frozen falls back to an equality scan of the other such items.
+    
+    Args:
+        iterable: Items to deduplicate
+        key: Optional function; items with equal key(item) are duplicates
+        
+    Yields:
+        Items in their original order, without duplicates
+        
+    Example:
+        list(iter_unique([1, 2, 2, 3, 1, 4])) -> [1, 2, 3, 4]
+        list(iter_unique(['a', 'B', 'b'], key=str.lower)) -> ['a', 'B']
+    """
+    seen = set()
+    unfrozen = []
+    for item in iterable:
+        k = item if key is None else key(item)
+        try:
+            if k in seen:
+                continue
+            seen.add(k)
+        except TypeError:
+            try:
+                frozen = _freeze(k)
+            except TypeError:
+                if k in unfrozen:
+                    continue
+                unfrozen.append(k)
+            else:
+                if frozen in seen:
+                    continue
+                seen.add(frozen)
+        yield item
+
+
+class _BloomFilter:
+    """Bloom filter over hashable keys, using double hashing into a bytearray."""
+    
+    def __init__(self, bits: int, hashes: int = 4):
+        self._size = max(8, bits)
+        self._bits = bytearray(-(-self._size // 8))
+        self._hashes = hashes
+    
+    def add(self, key) -> bool:
+        """Insert key; return True if it was definitely not present before."""
+        h1 = hash(key)
+        h2 = hash((h1, 0x9E3779B97F4A7C15)) | 1
+        bits = self._bits
+        new = False
+        for i in range(self._hashes):
+            position = (h1 + i * h2) % self._size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        return new
+
+
+# Fan-out used when a spilled partition is itself too big to dedupe in memory.
+_EXTERNAL_DEDUPE_FANOUT = 16
+_EXTERNAL_DEDUPE_MAX_DEPTH = 3
+# In-memory size of a partition's seen set relative to its pickled size.
+_EXTERNAL_DEDUPE_EXPANSION = 4
+
+
+# Spill key shared by every item whose key can be neither hashed nor frozen.
+_UNFREEZABLE_KEY = object()
+
+
+def _spill_key(item, key):
+    """Hashable key used to partition and dedupe item when spilling."""
+    k = item if key is None else key(item)
+    try:
+        return _hashable_key(k)
+    except TypeError:
+        return _UNFREEZABLE_KEY
+
+
+def _iter_pickled(path: str):
+    """Yield the records pickled back to back in path."""
+    with open(path, 'rb') as file:
+        # A fresh pickle.load per record: a shared Unpickler's memo would
+        # keep every record loaded so far alive.
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+
+def _dedupe_spill_file(path: str, key, memory_budget: int, depth: int) -> str:
+    """
+    Dedupe one partition of (seq, fresh, item) records, keeping seq order.
+    
+    Partitions whose seen set would outgrow the budget are split again with
+    a different hash and their survivors merged back by sequence number. Returns the path of
+    a file holding the surviving records.
+    """
+    if (os.path.getsize(path) * _EXTERNAL_DEDUPE_EXPANSION > memory_budget
+            and depth < _EXTERNAL_DEDUPE_MAX_DEPTH):
+        parts = [f'{path}.{i}' for i in range(_EXTERNAL_DEDUPE_FANOUT)]
+        files = [open(part, 'wb') for part in parts]
+        try:
+            for record in _iter_pickled(path):
+                k = _spill_key(record[2], key)
+                pickle.dump(record, files[hash((depth, k)) % len(files)], pickle.HIGHEST_PROTOCOL)
+        finally:
+            for file in files:
+                file.close()
+        os.remove(path)
+        survivors = [_dedupe_spill_file(part, key, memory_budget, depth + 1) for part in parts]
+        out = f'{path}.merged'
+        with open(out, 'wb') as file:
+            for record in heapq.merge(*map(_iter_pickled, survivors), key=itemgetter(0)):
+                pickle.dump(record, file, pickle.HIGHEST_PROTOCOL)
+        for survivor in survivors:
+            os.remove(survivor)
+        return out
+    
+    seen = set()
+    unfrozen = []
+    out = f'{path}.unique'
+    with open(out, 'wb') as file:
+        for record in _iter_pickled(path):
+            k = _spill_key(record[2], key)
+            if k is _UNFREEZABLE_KEY:
+                k = record[2] if key is None else key(record[2])
+                if k in unfrozen:
+                    continue
+                unfrozen.append(k)
+            else:
+                # Bloom-fresh records cannot be duplicates, so skip the lookup.
+                if not record[1] and k in seen:
+                    continue
+                seen.add(k)
+            pickle.dump(record, file, pickle.HIGHEST_PROTOCOL)
+    os.remove(path)
+    return out
+
+
+def iter_unique_external(iterable, key=None, memory_budget: int = 64 << 20,
+                         partitions: int = 64, bloom_bits: int = 0, tmpdir: str = None):
+    """
+    Out-of-core form of iter_unique for inputs larger than memory.
+    
+    Items are buffered until their estimated size exceeds memory_budget; if
+    the input ends first, it is deduplicated in memory. Otherwise every item
+    is pickled with its sequence number into one of `partitions` spill files
+    chosen by hashing its key. Each partition is then deduplicated on its
+    own and re-split if its keys would not fit in the budget. Finally the
+    partitions are merged back into first-occurrence order by sequence
+    number. As in iter_unique, keys that can be neither hashed nor frozen
+    are compared by equality; they all share one partition, so many of
+    them are slow.
+    
+    With bloom_bits set, a Bloom filter of that many bits marks items that
+    are certainly new when they are spilled. Partitions holding only such
+    items skip the dedupe pass entirely. The filter counts against
+    memory_budget while buffering and spilling (one at least as large as
+    the budget spills from the first item) and is freed before the
+    dedupe pass.
+    
+    memory_budget is an estimate, not a hard cap: item sizes come from
+    sys.getsizeof, partitions are sized from their pickled bytes, and
+    partitions still too big after _EXTERNAL_DEDUPE_MAX_DEPTH re-splits
+    are deduplicated in memory regardless.
+    
+    Args:
+        iterable: Items to deduplicate; must be picklable
+        key: Optional function; items with equal key(item) are duplicates
+        memory_budget: Approximate bytes of items held in memory (default 64 MiB)
+        partitions: Number of spill files (default 64)
+        bloom_bits: Size of the optional Bloom filter in bits (default 0: off)
+        tmpdir: Directory for spill files (default: the system temp dir)
+        
+    Yields:
+        Items in their original order, without duplicates
+        
+    Example:
+        iter_unique_external(read_records(), memory_budget=1 << 30,
+                             bloom_bits=4 << 30, tmpdir='/scratch')
+    """
+    items = iter(iterable)
+    buffered = []
+    # The Bloom filter's bytes come out of the in-memory buffer's share.
+    used = bloom_bits // 8
+    for item in items:
+        buffered.append(item)
+        used += sys.getsizeof(item) + 64
+        if used > memory_budget:
+            break
+    else:
+        yield from iter_unique(buffered, key)
+        return
+    
+    with tempfile.TemporaryDirectory(dir=tmpdir) as workdir:
+        bloom = _BloomFilter(bloom_bits) if bloom_bits else None
+        paths = [os.path.join(workdir, f'part-{i}') for i in range(partitions)]
+        maybe_duplicates = [0] * partitions
+        files = [open(path, 'wb') for path in paths]
+        try:
+            seq = 0
+            for source in (buffered, items):
+                for item in source:
+                    k = _spill_key(item, key)
+                    index = hash(k) % partitions
+                    fresh = bloom is not None and bloom.add(k)
+                    if not fresh:
+                        maybe_duplicates[index] += 1
+                    pickle.dump((seq, fresh, item), files[index], pickle.HIGHEST_PROTOCOL)
+                    seq += 1
+                buffered.clear()
+        finally:
+            for file in files:
+                file.close()
+        bloom = None
+        
+        survivors = [_dedupe_spill_file(path, key, memory_budget, 0) if maybe_duplicates[i] else path
+                     for i, path in enumerate(paths)]
+        for _, _, item in heapq.merge(*map(_iter_pickled, survivors), key=itemgetter(0)):
+            yield item
+
+
+def remove_duplicates_preserve_order(items: list) -> list:
+    """
+    Remove duplicates from list while preserving original order.
+    
+    Args:
+        items: List with potential duplicates
+        
+    Returns:
+        List with duplicates removed, original order maintained
+        
+    Example:
+        remove_duplicates_preserve_order([1, 2, 2, 3, 1, 4])
+        -> [1, 2, 3, 4]
+    """
+    return list(iter_unique(items))
+
+def validate_password(password: str) -> bool:
+    """
+    Validate password meets all requirements:
+    - At least 8 characters long
+    - Contains at least one uppercase letter
+    - Contains at least one lowercase letter
+    - Contains at least one digit
+    - Contains at least one special character (!@#$%^&*)
+    
+    Args:
+        password: String to validate
+        
+    Returns:
+        True if valid, False otherwise
+        
+    Example:
+        validate_password("Secure123!") -> True
+        validate_password("weak") -> False
+    """
+    pass
+
+# Bytes of sieve state per segment; one byte per odd number, sized to sit in L2.
+_SIEVE_SEGMENT_SIZE = 1 << 18
+_SIEVE_ZEROS = bytes(_SIEVE_SEGMENT_SIZE)
+
+
+def _base_primes(limit: int) -> list:
+    """Return the primes below limit with a plain odd-only sieve."""
+    if limit <= 2:
+        return []
+    sieve = bytearray([1]) * (limit // 2)
+    sieve[0] = 0
+    for i in range(1, (isqrt(limit - 1) + 1) // 2):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, len(sieve), p)))
+    return [2] + list(compress(range(1, 2 * len(sieve), 2), sieve))
+
+
+def _sieve_odd_segment(start: int, stop: int, base_primes: list) -> bytearray:
+    """
+    Sieve the odd numbers start, start + 2, ... below stop.
+
+    start must be odd and base_primes must hold every prime up to
+    isqrt(stop - 1). Flag i of the result is 1 when start + 2 * i is prime.
+    """
+    size = (stop - start + 1) // 2
+    flags = bytearray([1]) * size
+    zeros = memoryview(_SIEVE_ZEROS) if size <= _SIEVE_SEGMENT_SIZE else memoryview(bytes(size))
+    first = start // 2
+    for p in base_primes:
+        if p == 2:
+            continue
+        square = p * p
+        if square >= stop:
+            break
+        index = square // 2 - first
+        if index < 0:
+            index %= p
+        if index < size:
+            flags[index::p] = zeros[:(size - 1 - index) // p + 1]
+    if start == 1 and size:
+        flags[0] = 0
+    return flags
+
+
+def _iter_prime_segments(start: int, stop: int, base_primes: list = None):
+    """
+    Yield (first, flags) pairs covering the odd numbers in [start, stop).
+
+    Each pair describes one L2-sized segment in the format returned by
+    _sieve_odd_segment. The even prime 2 is left to the caller.
+    """
+    if stop <= 3:
+        return
+    if base_primes is None:
+        base_primes = _base_primes(isqrt(stop - 1) + 1)
+    low = max(start, 1) | 1
+    span = 2 * _SIEVE_SEGMENT_SIZE
+    while low < stop:
+        high = min(low + span, stop)
+        yield low, _sieve_odd_segment(low, high, base_primes)
+        low = high
+
+
+def iter_primes(limit: int):
+    """
+    Lazily yield all prime numbers up to (but not including) limit.
+
+    Primes are produced one sieve segment at a time, so memory stays
+    bounded by the segment size rather than by limit.
+
+    Args:
+        limit: Upper bound (exclusive)
+
+    Yields:
+        Prime numbers in increasing order
+
+    Example:
+        list(iter_primes(20)) -> [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    if limit > 2:
+        yield 2
+    for first, flags in _iter_prime_segments(3, limit):
+        yield from compress(range(first, first + 2 * len(flags), 2), flags)
+
+
+def _prime_chunk(bounds: tuple) -> array.array:
+    """Sieve the odd numbers in [start, stop) and return their primes as array('q')."""
+    start, stop, base_primes = bounds
+    primes = array.array('q')
+    for first, flags in _iter_prime_segments(start, stop, base_primes):
+        primes.extend(compress(range(first, first + 2 * len(flags), 2), flags))
+    return primes
+
+
+def _generate_primes_parallel(limit: int, workers: int) -> list:
+    """Sieve [0, limit) across a process pool; each worker returns its own primes."""
+    base_primes = _base_primes(isqrt(limit - 1) + 1)
+    # Several chunks per worker keep the pool busy when segments finish unevenly.
+    span = 2 * _SIEVE_SEGMENT_SIZE
+    chunk = max(span, -(-limit // (4 * workers * span)) * span)
+    tasks = [(low, min(low + chunk, limit), base_primes) for low in range(1, limit, chunk)]
+    
+    primes = array.array('q', [2])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_prime_chunk, tasks):
+            primes.extend(part)
+    
+    return primes.tolist()
+
+
+_FLAGS_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_DIGITS_TO_FLAGS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def _pack_flags(flags: bytes) -> bytes:
+    """Pack one-byte 0/1 flags into bits, most significant bit first."""
+    if not flags:
+        return b''
+    return int(flags.translate(_FLAGS_TO_DIGITS), 2).to_bytes(len(flags) // 8, 'big')
+
+
+def _unpack_bits(bits: bytes) -> bytes:
+    """Inverse of _pack_flags: expand each bit into a 0/1 byte."""
+    if not bits:
+        return b''
+    digits = format(int.from_bytes(bits, 'big'), '0%db' % (8 * len(bits)))
+    return digits.encode('ascii').translate(_DIGITS_TO_FLAGS)
+
+
+class PrimeStore:
+    """
+    On-disk prime table that is memory-mapped and extended incrementally.
+    
+    The file holds a 16-byte header (magic, covered limit) followed by one
+    bit per odd number. Queries below the covered limit are answered from
+    the map without sieving; queries above it sieve only the new range and
+    append it. Several processes may open the same file: extensions are
+    serialized with an exclusive lock and readers pick them up on demand.
+    
+    Example:
+        with PrimeStore('primes.bin') as store:
+            store.primes(20) -> [2, 3, 5, 7, 11, 13, 17, 19]
+    """
+    
+    _MAGIC = b'PRIMEBM1'
+    _HEADER = struct.Struct('<8sQ')
+    # Limits are kept on a 16-number boundary so the bitmap is whole bytes.
+    _ALIGN = 16
+    
+    def __init__(self, path: str):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(fd, 'r+b')
+        self._map = None
+        self._limit = 0
+        try:
+            with self._locked():
+                if os.fstat(fd).st_size < self._HEADER.size:
+                    self._file.seek(0)
+                    self._file.write(self._HEADER.pack(self._MAGIC, 0))
+                    self._file.flush()
+                self._remap()
+        except BaseException:
+            self.close()
+            raise
+    
+    @property
+    def limit(self) -> int:
+        """Exclusive upper bound of the numbers currently held in the map."""
+        return self._limit
+    
+    def _locked(self):
+        if fcntl is None:
+            return _NullLock()
+        return _FileLock(self._file, fcntl.LOCK_EX)
+    
+    def _read_limit(self) -> int:
+        self._file.seek(0)
+        magic, limit = self._HEADER.unpack(self._file.read(self._HEADER.size))
+        if magic != self._MAGIC:
+            raise ValueError(f'{self.path!r} is not a prime store')
+        return limit
+    
+    def _remap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, limit = self._HEADER.unpack_from(self._map)
+        if magic != self._MAGIC:
+            raise ValueError(f'{self.path!r} is not a prime store')
+        self._limit = limit
+    
+    def extend(self, limit: int) -> None:
+        """Make sure every number below limit is covered by the store."""
+        if limit <= self._limit:
+            return
+        with self._locked():
+            stored = self._read_limit()
+            target = -(-limit // self._ALIGN) * self._ALIGN
+            if stored < target:
+                base_primes = _base_primes(isqrt(target - 1) + 1)
+                self._file.seek(self._HEADER.size + stored // self._ALIGN)
+                for _, flags in _iter_prime_segments(stored + 1, target, base_primes):
+                    self._file.write(_pack_flags(flags))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.seek(0)
+                self._file.write(self._HEADER.pack(self._MAGIC, target))
+                self._file.flush()
+            self._remap()
+    
+    def iter_primes(self, limit: int):
+        """Yield the primes below limit, extending the store first if needed."""
+        self.extend(limit)
+        if limit > 2:
+            yield 2
+        size = limit // 2
+        step = _SIEVE_SEGMENT_SIZE // 8
+        header = self._HEADER.size
+        for offset in range(0, -(-size // 8), step):
+            flags = _unpack_bits(self._map[header + offset:header + offset + step])
+            flags = flags[:size - 8 * offset]
+            first = 16 * offset + 1
+            yield from compress(range(first, first + 2 * len(flags), 2), flags)
+    
+    def primes(self, limit: int) -> list:
+        """Return the primes below limit, extending the store first if needed."""
+        return list(self.iter_primes(limit))
+    
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _FileLock:
+    """Context manager holding an flock on an open file."""
+    
+    def __init__(self, file, operation: int):
+        self._file = file
+        self._operation = operation
+    
+    def __enter__(self):
+        fcntl.flock(self._file.fileno(), self._operation)
+        return self
+    
+    def __exit__(self, *exc_info):
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+
+class _NullLock:
+    """Stand-in for _FileLock on platforms without fcntl."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        pass
+
+
+def generate_primes(limit: int, workers: int = None, store: PrimeStore = None) -> list:
+    """
+    Generate all prime numbers up to (but not including) limit.
+    
+    Args:
+        limit: Upper bound (exclusive)
+        workers: Number of worker processes to sieve with. None or 1 sieves
+            in the calling process; pass os.cpu_count() to use every core.
+            Small limits are always sieved in-process.
+        store: Optional PrimeStore to answer from; only the range above
+            its covered limit is sieved.
+        
+    Returns:
+        List of prime numbers
+        
+    Example:
+        generate_primes(20) -> [2, 3, 5, 7, 11, 13, 17, 19]
+        generate_primes(10 ** 9, workers=16)
+    """
+    if store is not None:
+        return store.primes(limit)
+    if workers is not None and workers > 1 and limit > 4 * _SIEVE_SEGMENT_SIZE:
+        return _generate_primes_parallel(limit, workers)
+    
+    primes = [2] if limit > 2 else []
+    for first, flags in _iter_prime_segments(3, limit):
+        primes.extend(compress(range(first, first + 2 * len(flags), 2), flags))
+    
+    return primes
+
+# Numbers below this are answered from a precomputed flag table.
+_SMALL_PRIME_LIMIT = 1 << 16
+_SMALL_PRIMES = _base_primes(_SMALL_PRIME_LIMIT)
+_SMALL_PRIME_FLAGS = bytearray(_SMALL_PRIME_LIMIT)
+for _p in _SMALL_PRIMES:
+    _SMALL_PRIME_FLAGS[_p] = 1
+del _p
+# Product of the primes below 256, for one-gcd rejection of most composites.
+_TRIAL_PRODUCT = prod(_SMALL_PRIMES[:54])
+# Miller-Rabin witnesses: Sinclair's set is deterministic below 2**64.
+_MILLER_RABIN_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+def _miller_rabin(n: int, bases: tuple) -> bool:
+    """Strong-probable-prime test of odd n > 37 to the given bases."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas(n: int) -> bool:
+    """Strong Lucas probable-prime test of odd n > 37 with Selfridge's parameters."""
+    if isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    
+    d = n + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    # Walk the bits of d, keeping U_k, V_k and Q**k modulo n.
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            U = (U + n if U & 1 else U) // 2 % n
+            V = (V + n if V & 1 else V) // 2 % n
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def is_prime(n: int) -> bool:
+    """
+    Check whether n is prime.
+    
+    Small n are looked up in a table; larger n are screened against the
+    small primes and then settled with Miller-Rabin, which is deterministic
+    for every 64-bit input. From 2**64 up the answer comes from the
+    Baillie-PSW test (Miller-Rabin to base 2 plus a strong Lucas test):
+    no composite is known to pass it, but it is a probable-prime answer,
+    not a proof.
+    
+    Args:
+        n: Integer to test
+        
+    Returns:
+        True if n is prime, False otherwise
+        
+    Example:
+        is_prime(97) -> True
+        is_prime(2 ** 61 - 1) -> True
+    """
+    if n < _SMALL_PRIME_LIMIT:
+        return n > 0 and _SMALL_PRIME_FLAGS[n] == 1
+    if gcd(n, _TRIAL_PRODUCT) != 1:
+        return False
+    if n < 1 << 64:
+        return _miller_rabin(n, _MILLER_RABIN_BASES_64)
+    return _miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+def is_prime_many(numbers) -> list:
+    """
+    Batch form of is_prime.
+    
+    Args:
+        numbers: Iterable of integers
+        
+    Returns:
+        List of booleans, one per input, in input order
+        
+    Example:
+        is_prime_many([1, 2, 9, 11]) -> [False, True, False, True]
+    """
+    return [is_prime(n) for n in numbers]
+
+
+def next_prime(n: int) -> int:
+    """
+    Find the smallest prime strictly greater than n.
+    
+    Primality is decided by is_prime, so results from 2**64 up are
+    Baillie-PSW probable primes.
+    
+    Args:
+        n: Starting point
+        
+    Returns:
+        The next prime after n
+        
+    Example:
+        next_prime(13) -> 17
+    """
+    if n < 2:
+        return 2
+    candidate = n + 1 if n % 2 == 0 else n + 2
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+def next_prime_many(numbers) -> list:
+    """
+    Batch form of next_prime.
+    
+    Args:
+        numbers: Iterable of integers
+        
+    Returns:
+        List with the next prime after each input, in input order
+        
+    Example:
+        next_prime_many([0, 13, 100]) -> [2, 17, 101]
+    """
+    return [next_prime(n) for n in numbers]
+
+
+def prime_count(a: int, b: int) -> int:
+    """
+    Count the primes p with a <= p < b.
+    
+    Wide ranges are counted with the segmented sieve; ranges narrower than
+    the square root of b are checked number by number instead.
+    
+    Args:
+        a: Lower bound (inclusive)
+        b: Upper bound (exclusive)
+        
+    Returns:
+        Number of primes in [a, b)
+        
+    Example:
+        prime_count(0, 100) -> 25
+    """
+    if b <= max(a, 2):
+        return 0
+    count = 1 if a <= 2 else 0
+    start = max(a, 3) | 1
+    if b - start < isqrt(b - 1):
+        return count + sum(1 for n in range(start, b, 2) if is_prime(n))
+    for _, flags in _iter_prime_segments(start, b):
+        count += flags.count(1)
+    return count
+
+
+def nth_prime(k: int) -> int:
+    """
+    Find the k-th prime, counting from nth_prime(1) == 2.
+    
+    Args:
+        k: 1-based position of the prime
+        
+    Returns:
+        The k-th prime number
+        
+    Example:
+        nth_prime(1) -> 2
+        nth_prime(10) -> 29
+    """
+    if k < 1:
+        raise ValueError('k must be at least 1')
+    if k <= len(_SMALL_PRIMES):
+        return _SMALL_PRIMES[k - 1]
+    # Rosser's bound: p_k < k (ln k + ln ln k) for k >= 6.
+    bound = int(k * (log(k) + log(log(k)))) + 1
+    remaining = k - 1
+    for first, flags in _iter_prime_segments(3, bound):
+        found = flags.count(1)
+        if found < remaining:
+            remaining -= found
+            continue
+        index = -1
+        for _ in range(remaining):
+            index = flags.index(1, index + 1)
+        return first + 2 * index
+    raise AssertionError('prime bound too small')  # pragma: no cover
+
+
+def binary_search(sorted_list: list, target: int) -> int:
+    """
+    Implement binary search to find target in sorted list.
+    
+    Args:
+        sorted_list: Sorted list of integers
+        target: Value to find
+        
+    Returns:
+        Index of target if found, -1 otherwise
+        
+    Example:
+        binary_search([1, 3, 5, 7, 9], 5) -> 2
+        binary_search([1, 3, 5, 7, 9], 4) -> -1
+    """
+    l = 0
+    r = len(sorted_list)
     
     while l < r:
         mid = (l + r) // 2
@@ -233,10 +2437,365 @@ def binary_search(sorted_list: list, target: int) -> int:
             l = mid + 1
         
         if target < sorted_list[mid]:
-            r = mid - 1
+            r = mid
         
     return -1
 
+
+# Lists are converted for searchsorted once targets * ratio >= keys.
+_SEARCHSORTED_MIN_RATIO = 8
+
+
+def _binary_search_many_numpy(sorted_list, targets: list):
+    """searchsorted form of binary_search_many, or None for non-numeric data."""
+    data = np.asarray(sorted_list)
+    queries = np.asarray(targets)
+    if data.ndim != 1 or data.dtype.kind not in 'iuf' or queries.dtype.kind not in 'iuf':
+        return None
+    positions = np.searchsorted(data, queries, side='left')
+    if not len(data):
+        return [-1] * len(targets)
+    found = data[np.minimum(positions, len(data) - 1)] == queries
+    return np.where(found, positions, -1).tolist()
+
+
+def binary_search_many(sorted_list, targets) -> list:
+    """
+    Batch form of binary_search for many queries against one sorted list.
+    
+    The queries are sorted and swept in ascending order. Each search starts
+    where the previous one ended and gallops forward (1, 2, 4, ... elements)
+    before bisecting, so clustered queries cost O(log gap) instead of
+    O(log n) each. Numeric data is handed to NumPy's searchsorted when NumPy
+    is installed and either sorted_list is already an ndarray or the batch
+    holds at least 1/_SEARCHSORTED_MIN_RATIO as many queries as there are
+    keys, so the O(n) list conversion pays off. For duplicated values the
+    leftmost index is returned.
+    
+    Args:
+        sorted_list: Sorted sequence (a list, array or NumPy array)
+        targets: Iterable of values to find
+        
+    Returns:
+        List with the index of each target, or -1, in query order
+        
+    Example:
+        binary_search_many([1, 3, 5, 7, 9], [9, 4, 1]) -> [4, -1, 0]
+    """
+    targets = list(targets)
+    # Converting a list to an ndarray is O(n), so only do it for big batches.
+    if np is not None and targets and (isinstance(sorted_list, np.ndarray)
+                                       or len(targets) * _SEARCHSORTED_MIN_RATIO >= len(sorted_list)):
+        result = _binary_search_many_numpy(sorted_list, targets)
+        if result is not None:
+            return result
+    
+    n = len(sorted_list)
+    result = [-1] * len(targets)
+    lo = 0
+    for i in sorted(range(len(targets)), key=targets.__getitem__):
+        target = targets[i]
+        hi = lo
+        step = 1
+        while hi < n and sorted_list[hi] < target:
+            lo = hi + 1
+            hi += step
+            step <<= 1
+        lo = bisect_left(sorted_list, target, lo, min(hi, n))
+        if lo < n and sorted_list[lo] == target:
+            result[i] = lo
+    return result
+
+
+# Keys copied per slice assignment while building a SortedIndex.
+_EYTZINGER_BLOCK = 1 << 16
+
+
+def _eytzinger_runs(n: int):
+    """
+    Yield (slot, rank, step, count) runs covering the Eytzinger layout of n keys.
+    
+    Slots slot .. slot + count - 1 hold the sorted keys rank, rank + step, ...
+    Each level of the tree is at most two such arithmetic runs: in a perfect
+    tree the j-th node of a level with subtree span s has rank (2j + 1)s - 1,
+    and every node to the right of the last leaf shifts left by the number
+    of missing leaves before it.
+    """
+    if not n:
+        return
+    height = n.bit_length()
+    leaves = n - (1 << (height - 1)) + 1
+    for level in range(height - 1):
+        width = 1 << level
+        span = 1 << (height - 1 - level)
+        split = min(width, (2 * leaves // span + 1) // 2)
+        yield width, span - 1, 2 * span, split
+        yield width + split, split * span + span // 2 - 1 + leaves, span, width - split
+    yield 1 << (height - 1), 0, 2, leaves
+
+
+class SortedIndex:
+    """
+    Static search index over a sorted sequence, in Eytzinger layout.
+    
+    The keys are stored unboxed in an array, in the breadth-first order of
+    an implicit binary search tree. Slot k has children 2k and 2k + 1, so a
+    search walks forward through memory. The top levels of the tree, which
+    every search visits, share a few cache lines, and the next probe's
+    slots are adjacent. A parallel array maps each slot back to its
+    position in the sorted input. find returns the leftmost match, which
+    is one of the indices binary_search may return for duplicated keys.
+    
+    Example:
+        index = SortedIndex([1, 2, 2, 2, 3, 5])
+        index.find(2) -> 1
+        index.find_right(2) -> 3
+        index.lower_bound(4) -> 5
+        index.find(4) -> -1
+    """
+    
+    def __init__(self, sorted_keys, typecode: str = 'q'):
+        n = len(sorted_keys)
+        self._keys = array.array(typecode, [0]) * (n + 1)
+        self._ranks = array.array('q', [0]) * (n + 1)
+        # Fill run by run with bounded slice assignments, so the only
+        # full-size allocations are the two arrays themselves.
+        for slot, rank, step, count in _eytzinger_runs(n):
+            for offset in range(0, count, _EYTZINGER_BLOCK):
+                size = min(_EYTZINGER_BLOCK, count - offset)
+                first = rank + offset * step
+                last = first + (size - 1) * step + 1
+                self._keys[slot + offset:slot + offset + size] = array.array(
+                    typecode, sorted_keys[first:last:step])
+                self._ranks[slot + offset:slot + offset + size] = array.array(
+                    'q', range(first, last, step))
+        self._n = n
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def __contains__(self, key) -> bool:
+        return self.find(key) != -1
+    
+    def _first_slot(self, key, inclusive: bool) -> int:
+        """Slot of the first key >= key (> key if not inclusive), or 0 if none."""
+        keys = self._keys
+        n = self._n
+        found = 0
+        k = 1
+        if inclusive:
+            while k <= n:
+                if keys[k] >= key:
+                    found = k
+                    k = 2 * k
+                else:
+                    k = 2 * k + 1
+        else:
+            while k <= n:
+                if keys[k] > key:
+                    found = k
+                    k = 2 * k
+                else:
+                    k = 2 * k + 1
+        return found
+    
+    def lower_bound(self, key) -> int:
+        """Index of the first key >= key, or len(self) if there is none."""
+        slot = self._first_slot(key, True)
+        return self._ranks[slot] if slot else self._n
+    
+    def upper_bound(self, key) -> int:
+        """Index of the first key > key, or len(self) if there is none."""
+        slot = self._first_slot(key, False)
+        return self._ranks[slot] if slot else self._n
+    
+    def find_left(self, key) -> int:
+        """Index of the first occurrence of key, or -1."""
+        slot = self._first_slot(key, True)
+        if slot and self._keys[slot] == key:
+            return self._ranks[slot]
+        return -1
+    
+    def find_right(self, key) -> int:
+        """Index of the last occurrence of key, or -1."""
+        if self.find_left(key) == -1:
+            return -1
+        return self.upper_bound(key) - 1
+    
+    def find(self, key) -> int:
+        """Index of key, or -1; the leftmost occurrence when key is duplicated."""
+        return self.find_left(key)
+
+
+# memoryview/struct format characters of the supported key widths.
+_KEY_FORMATS = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+
+
+def _key_format(width: int, signed: bool) -> str:
+    if width not in _KEY_FORMATS:
+        raise ValueError(f'width must be one of {sorted(_KEY_FORMATS)}')
+    code = _KEY_FORMATS[width]
+    return code if signed else code.upper()
+
+
+class _LittleEndianKeys(Sequence):
+    """Read-only view of little-endian integers in a buffer, for big-endian hosts."""
+    
+    __slots__ = ('_buffer', '_struct', '_length')
+    
+    def __init__(self, buffer, code: str):
+        self._buffer = buffer
+        self._struct = struct.Struct('<' + code)
+        self._length = len(buffer) // self._struct.size
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('key index out of range')
+        return self._struct.unpack_from(self._buffer, index * self._struct.size)[0]
+
+
+def write_sorted_keys(path: str, keys, width: int = 8, signed: bool = True) -> None:
+    """
+    Write integers as fixed-width little-endian keys for SortedKeyFile.
+    
+    Args:
+        path: Output file path
+        keys: Iterable of integers, in ascending order
+        width: Bytes per key: 1, 2, 4 or 8 (default 8)
+        signed: Whether keys are signed (default True)
+        
+    Example:
+        write_sorted_keys('keys.bin', range(0, 200000, 2))
+    """
+    code = _key_format(width, signed)
+    keys = iter(keys)
+    with open(path, 'wb') as out:
+        while True:
+            chunk = array.array(code, islice(keys, 1 << 16))
+            if not chunk:
+                break
+            if sys.byteorder != 'little':
+                chunk.byteswap()
+            out.write(chunk.tobytes())
+
+
+class SortedKeyFile:
+    """
+    Binary search over a memory-mapped file of sorted fixed-width integers.
+    
+    The file is mapped read-only and searched in place: on little-endian
+    hosts through a memoryview cast to the key type, elsewhere through
+    struct. Opening is O(1) whatever the file size, only the pages a search
+    touches are read, and every process mapping the file shares the same
+    page cache. With interpolation=True, searches probe where a key would
+    sit if keys were evenly spread, which takes O(log log n) probes on
+    uniform data; the final step is always a bisect, so skewed data is
+    still O(log n).
+    
+    Example:
+        write_sorted_keys('keys.bin', [1, 3, 5, 7, 9])
+        with SortedKeyFile('keys.bin') as keys:
+            keys.search(7) -> 3
+            keys.search(4) -> -1
+    """
+    
+    # Interpolation probes tried before finishing with a plain bisect.
+    _MAX_INTERPOLATION_PROBES = 32
+    
+    def __init__(self, path: str, width: int = 8, signed: bool = True,
+                 interpolation: bool = False):
+        code = _key_format(width, signed)
+        self.path = path
+        self.interpolation = interpolation
+        self._map = None
+        self._view = None
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size % width:
+                raise ValueError(f'{path!r} is not a whole number of {width}-byte keys')
+            if size:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map is None:
+            self._keys = ()
+        elif sys.byteorder == 'little':
+            self._view = memoryview(self._map)
+            self._keys = self._view.cast(code)
+        else:
+            self._keys = _LittleEndianKeys(self._map, code)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __getitem__(self, index: int) -> int:
+        return self._keys[index]
+    
+    def __contains__(self, key) -> bool:
+        return self.search(key) != -1
+    
+    def _interpolate(self, key) -> tuple:
+        """Narrow [lo, hi) around the leftmost position of key by interpolation."""
+        keys = self._keys
+        lo, hi = 0, len(keys)
+        for _ in range(self._MAX_INTERPOLATION_PROBES):
+            if hi - lo < 2:
+                break
+            first, last = keys[lo], keys[hi - 1]
+            if not first < key <= last:
+                break
+            # int() and the clamp keep float keys from producing a float
+            # or rounded-past-the-end probe.
+            pos = min(hi - 1, lo + int((key - first) * (hi - 1 - lo) // (last - first)))
+            value = keys[pos]
+            if value < key:
+                lo = pos + 1
+            else:
+                hi = pos + 1
+                if value == key:
+                    break
+        return lo, hi
+    
+    def lower_bound(self, key) -> int:
+        """Index of the first key >= key, or len(self) if there is none."""
+        if self.interpolation:
+            lo, hi = self._interpolate(key)
+            return bisect_left(self._keys, key, lo, hi)
+        return bisect_left(self._keys, key)
+    
+    def upper_bound(self, key) -> int:
+        """Index of the first key > key, or len(self) if there is none."""
+        return bisect_right(self._keys, key)
+    
+    def search(self, key) -> int:
+        """Index of key, or -1; the leftmost occurrence when key is duplicated."""
+        i = self.lower_bound(key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return -1
+    
+    def close(self) -> None:
+        if isinstance(self._keys, memoryview):
+            self._keys.release()
+        self._keys = ()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
 # print(transpose_matrix([[1, 2, 3], [4, 5, 6]]))
 # print( calculate_final_grades({
 #             'Alice': {'assignments': [80, 90, 85], 'midterm': 88, 'final': 92}
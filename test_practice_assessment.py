@@ -3,22 +3,82 @@ import sys
 from pathlib import Path
 import string
 import random
+import bisect
+import tempfile
+import os
+import io
+import mmap
+import array
+import struct
+import csv
+import json
+import threading
+from unittest import mock
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
 
 sys.path.insert(0, str(Path(__file__).parent))
 
 from practice_assessment import (
     flatten_nested_list,
+    iter_flatten,
     merge_catalogs,
+    merge_catalogs_many,
+    CatalogStore,
+    merge_catalog_files,
     validate_password,
     transpose_matrix,
+    TransposedView,
+    transpose_binary_file,
+    transpose_csv_file,
     remove_duplicates_preserve_order,
+    iter_unique,
+    iter_unique_external,
     calculate_final_grades,
+    calculate_final_grades_columnar,
+    students_to_columns,
+    Gradebook,
+    iter_final_grades_file,
+    write_final_grades_file,
     word_frequency,
+    word_frequency_stream,
+    word_frequency_parallel,
+    SpaceSaving,
+    WordFrequencyIndex,
+    tokenize,
+    count_words,
     generate_primes,
+    iter_primes,
+    PrimeStore,
+    is_prime,
+    is_prime_many,
+    next_prime,
+    next_prime_many,
+    prime_count,
+    nth_prime,
     binary_search,
+    binary_search_many,
+    SortedIndex,
+    SortedKeyFile,
+    write_sorted_keys,
 )
 
 
+class _UnhashableRecord:
+    """Picklable value type that can be neither hashed nor frozen."""
+    
+    __hash__ = None
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def __eq__(self, other):
+        return isinstance(other, _UnhashableRecord) and self.value == other.value
+
+
 class TestPracticeAssessment(unittest.TestCase):
     
     # ==================================================================================
@@ -65,6 +125,87 @@ class TestPracticeAssessment(unittest.TestCase):
         """Edge case: Only nested empty lists"""
         self.assertEqual(flatten_nested_list([[], [[]], [[[]]]]), [])
     
+    def test_flatten_nested_list_stress_very_deep_nesting(self):
+        """Stress test: Nesting far beyond the recursion limit"""
+        nested = [1]
+        for i in range(2, 200001):
+            nested = [nested, i]
+        result = flatten_nested_list(nested)
+        self.assertEqual(result, list(range(1, 200001)))
+    
+    def test_iter_flatten_lazy(self):
+        leaves = iter_flatten([1, [2, [3, [4]]], 5])
+        self.assertEqual(next(leaves), 1)
+        self.assertEqual(list(leaves), [2, 3, 4, 5])
+    
+    def test_iter_flatten_max_depth(self):
+        nested = [1, [2, [3, [4]]], [[]]]
+        self.assertEqual(list(iter_flatten(nested, max_depth=0)), nested)
+        self.assertEqual(list(iter_flatten(nested, max_depth=1)), [1, 2, [3, [4]], []])
+        self.assertEqual(list(iter_flatten(nested, max_depth=2)), [1, 2, 3, [4]])
+        self.assertEqual(list(iter_flatten(nested, max_depth=3)), [1, 2, 3, 4])
+    
+    def test_flatten_nested_list_typed(self):
+        nested = [1, [2.5, [3]], [[4, [5.0]]]]
+        result = flatten_nested_list(nested, dtype='d')
+        self.assertIsInstance(result, array.array)
+        self.assertEqual(result, array.array('d', [1, 2.5, 3, 4, 5]))
+        self.assertEqual(flatten_nested_list([[1, 2], [3, [4]]], dtype='q'), array.array('q', [1, 2, 3, 4]))
+    
+    def test_flatten_nested_list_typed_buffer_leaves(self):
+        """Buffer-protocol leaves are copied in bulk"""
+        nested = [
+            array.array('d', [1, 2]),
+            [memoryview(array.array('d', [3.0])), array.array('i', [4])],
+            memoryview(struct.pack('dd', 5.0, 6.0)).cast('d'),
+        ]
+        result = flatten_nested_list(nested, dtype='d')
+        self.assertEqual(result, array.array('d', [1, 2, 3, 4, 5, 6]))
+    
+    def test_flatten_nested_list_typed_edge_unsigned_byte_array(self):
+        """Edge case: array('B') leaves are numbers, not raw bytes"""
+        result = flatten_nested_list([array.array('B', [1, 2, 3, 4, 5, 6, 7, 8])], dtype='d')
+        self.assertEqual(result, array.array('d', [1, 2, 3, 4, 5, 6, 7, 8]))
+        result = flatten_nested_list([array.array('B', [1, 255]), memoryview(bytes([7]))], dtype='q')
+        self.assertEqual(result, array.array('q', [1, 255, 7]))
+        result = flatten_nested_list([array.array('B', [9]), b'\x01'], dtype='B')
+        self.assertEqual(result, array.array('B', [9, 1]))
+    
+    def test_flatten_nested_list_typed_edge_bytes_leaves(self):
+        """Edge case: bytes and bytearray leaves are byte values, like memoryview"""
+        self.assertEqual(flatten_nested_list([b'\x07'], dtype='q'), array.array('q', [7]))
+        self.assertEqual(flatten_nested_list([b'\x07'], dtype='q'),
+                         flatten_nested_list([memoryview(b'\x07')], dtype='q'))
+        result = flatten_nested_list([[bytearray(b'\x01\xff')], b'\x02\x03\x04'], dtype='d')
+        self.assertEqual(result, array.array('d', [1, 255, 2, 3, 4]))
+    
+    def test_flatten_nested_list_typed_edge_explicit_byte_order(self):
+        """Edge case: Buffers with an explicit byte order, such as ctypes arrays"""
+        import ctypes
+        little = (ctypes.c_double * 3)(1, 2, 3)
+        big = (ctypes.c_double.__ctype_be__ * 2)(4, 5)
+        self.assertEqual(memoryview(big).format, '>d')
+        result = flatten_nested_list([little, [big]], dtype='d')
+        self.assertEqual(result, array.array('d', [1, 2, 3, 4, 5]))
+        result = flatten_nested_list([((ctypes.c_int16 * 2) * 2)((1, -2), (3, 4))], dtype='q')
+        self.assertEqual(result, array.array('q', [1, -2, 3, 4]))
+    
+    def test_flatten_nested_list_typed_edge_bad_leaf(self):
+        """Edge case: Non-numeric leaves are rejected"""
+        with self.assertRaises(TypeError):
+            flatten_nested_list([1, ['x']], dtype='d')
+        self.assertEqual(flatten_nested_list([[], [[]]], dtype='d'), array.array('d'))
+    
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_flatten_nested_list_as_numpy(self):
+        result = flatten_nested_list([1, [2.5, [array.array('d', [3, 4])]]], as_numpy=True)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.dtype, np.float64)
+        self.assertEqual(result.tolist(), [1.0, 2.5, 3.0, 4.0])
+        result = flatten_nested_list([[1, 2], [np.array([3, 4], dtype=np.uint8)]], dtype='q', as_numpy=True)
+        self.assertEqual(result.dtype, np.int64)
+        self.assertEqual(result.tolist(), [1, 2, 3, 4])
+    
     # ==================================================================================
     # Question 2: Merge Catalogs Tests
     # ==================================================================================
@@ -114,6 +255,133 @@ class TestPracticeAssessment(unittest.TestCase):
         result = merge_catalogs({'apple': 0}, {'apple': 5})
         self.assertEqual(result, {'apple': 5})
     
+    def test_merge_catalogs_many(self):
+        result = merge_catalogs_many({'apple': 5, 'banana': 3}, {'apple': 2, 'orange': 4}, {'banana': 1})
+        self.assertEqual(result, {'apple': 7, 'banana': 4, 'orange': 4})
+        self.assertEqual(merge_catalogs_many(), {})
+    
+    def test_merge_catalogs_many_stress_hundreds(self):
+        """Stress test: 300 catalogs merged in one pass"""
+        catalogs = [{f'item_{(w * 7 + i) % 1000}': 1 for i in range(100)} for w in range(300)]
+        result = merge_catalogs_many(*catalogs)
+        expected = {}
+        for catalog in catalogs:
+            expected = merge_catalogs(expected, catalog)
+        self.assertEqual(result, expected)
+        self.assertEqual(sum(result.values()), 30000)
+    
+    def test_merge_catalogs_many_in_place_and_combine(self):
+        target = {'apple': 5}
+        source = {'apple': 2, 'pear': 1}
+        result = merge_catalogs_many(source, into=target)
+        self.assertIs(result, target)
+        self.assertEqual(target, {'apple': 7, 'pear': 1})
+        self.assertEqual(source, {'apple': 2, 'pear': 1})
+        self.assertEqual(merge_catalogs_many({'apple': 5}, {'apple': 2}, combine=max), {'apple': 5})
+        # sum takes an iterable, so it is treated as the default addition
+        self.assertEqual(merge_catalogs_many({'apple': 5}, {'apple': 2, 'pear': 1}, combine=sum),
+                         {'apple': 7, 'pear': 1})
+    
+    def test_catalog_store_matches_merge_catalogs(self):
+        store = CatalogStore({'apple': 5, 'banana': 3}, shards=4)
+        store.merge({'apple': 2, 'orange': 4})
+        store.apply_delta('banana', -1)
+        store.apply_delta('kiwi', 6)
+        self.assertEqual(store.snapshot(), {'apple': 7, 'banana': 2, 'orange': 4, 'kiwi': 6})
+        self.assertEqual(store.get('apple'), 7)
+        self.assertIsNone(store.get('pear'))
+        self.assertIn('kiwi', store)
+        self.assertEqual(len(store), 4)
+    
+    def test_catalog_store_stress_concurrent_merges(self):
+        """Stress test: 8 threads merging overlapping catalogs"""
+        store = CatalogStore(shards=8)
+        catalogs = [{f'item_{(t * 13 + i) % 500}': 1 for i in range(200)} for t in range(8)]
+        snapshots = []
+        
+        def worker(catalog):
+            for _ in range(50):
+                store.merge(catalog)
+                store.apply_delta('shared', 1)
+            snapshots.append(store.snapshot())
+        
+        threads = [threading.Thread(target=worker, args=(c,)) for c in catalogs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = merge_catalogs_many(*catalogs * 50)
+        expected['shared'] = 400
+        self.assertEqual(store.snapshot(), expected)
+        for snapshot in snapshots:
+            merged = sum(snapshot.values()) - snapshot.get('shared', 0)
+            self.assertEqual(merged % 200, 0)
+    
+    def _write_catalog(self, path, rows):
+        with open(path, 'w', newline='') as file:
+            csv.writer(file).writerows(rows)
+    
+    def _read_catalog(self, path):
+        with open(path, newline='') as file:
+            rows = list(csv.reader(file))
+        return [(product, int(quantity) if quantity.lstrip('-').isdigit() else float(quantity))
+                for product, quantity in rows]
+    
+    def test_merge_catalog_files_matches_merge_catalogs(self):
+        catalog_a = {'banana': 3, 'apple': 5, 'pear': 1.5}
+        catalog_b = {'apple': 2, 'orange': 4, 'pear': 2}
+        with tempfile.TemporaryDirectory() as workdir:
+            a, b, dst = (os.path.join(workdir, name) for name in ('a.csv', 'b.csv', 'out.csv'))
+            self._write_catalog(a, catalog_a.items())
+            self._write_catalog(b, catalog_b.items())
+            merge_catalog_files([a, b], dst)
+            rows = self._read_catalog(dst)
+        self.assertEqual([product for product, _ in rows], sorted(product for product, _ in rows))
+        self.assertEqual(dict(rows), merge_catalogs(catalog_a, catalog_b))
+    
+    def test_merge_catalog_files_stress_many_runs(self):
+        """Stress test: small runs force several levels of k-way merging"""
+        rng = random.Random(22)
+        catalogs = [{f'sku_{rng.randrange(3000):05d}': rng.randint(-5, 50) for _ in range(2000)}
+                    for _ in range(3)]
+        with tempfile.TemporaryDirectory() as workdir:
+            paths = []
+            for i, catalog in enumerate(catalogs):
+                paths.append(os.path.join(workdir, f'in-{i}.csv'))
+                self._write_catalog(paths[-1], catalog.items())
+            dst = os.path.join(workdir, 'out.csv')
+            merge_catalog_files(paths, dst, run_size=10, tmpdir=workdir)
+            rows = self._read_catalog(dst)
+        self.assertEqual(dict(rows), merge_catalogs_many(*catalogs))
+        self.assertEqual(len(rows), len(dict(rows)))
+    
+    def test_merge_catalog_files_stress_float_quantities_exact(self):
+        """Stress test: Float sums match merge_catalogs bit for bit across >128 runs"""
+        rng = random.Random(122)
+        catalogs = [{f'p{i}': rng.uniform(-1, 1) for i in range(20)} for _ in range(30)]
+        with tempfile.TemporaryDirectory() as workdir:
+            paths = []
+            for i, catalog in enumerate(catalogs):
+                paths.append(os.path.join(workdir, f'in-{i}.csv'))
+                self._write_catalog(paths[-1], catalog.items())
+            dst = os.path.join(workdir, 'out.csv')
+            merge_catalog_files(paths, dst, run_size=2)
+            rows = self._read_catalog(dst)
+        expected = merge_catalogs(catalogs[0], catalogs[1])
+        for catalog in catalogs[2:]:
+            expected = merge_catalogs(expected, catalog)
+        self.assertEqual(dict(rows), expected)
+    
+    def test_merge_catalog_files_edge_repeated_products_and_empty(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            a, empty, dst = (os.path.join(workdir, name) for name in ('a.csv', 'e.csv', 'out.csv'))
+            self._write_catalog(a, [('apple', 1), ('apple', 2), ('kiwi', 3), ('apple', 4)])
+            self._write_catalog(empty, [])
+            merge_catalog_files([a, empty], dst, run_size=2)
+            self.assertEqual(self._read_catalog(dst), [('apple', 7), ('kiwi', 3)])
+            merge_catalog_files([empty], dst)
+            self.assertEqual(self._read_catalog(dst), [])
+    
     # ==================================================================================
     # Question 3: Transpose Matrix Tests
     # ==================================================================================
@@ -172,6 +440,118 @@ class TestPracticeAssessment(unittest.TestCase):
         result = transpose_matrix([[42]])
         self.assertEqual(result, [[42]])
     
+    def test_transpose_matrix_backends_agree(self):
+        rng = random.Random(3)
+        for rows, cols in [(1, 1), (1, 7), (7, 1), (300, 513), (600, 257)]:
+            matrix = [[rng.random() for _ in range(cols)] for _ in range(rows)]
+            expected = [[matrix[i][j] for i in range(rows)] for j in range(cols)]
+            for backend in ['auto', 'zip', 'tiled']:
+                self.assertEqual(transpose_matrix(matrix, backend), expected)
+    
+    def test_transpose_matrix_edge_unknown_backend(self):
+        """Edge case: Unknown backend name"""
+        with self.assertRaises(ValueError):
+            transpose_matrix([[1]], backend='gpu')
+    
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_transpose_matrix_numpy_backend(self):
+        matrix = [[1, 2, 3], [4, 5, 6]]
+        self.assertEqual(transpose_matrix(matrix, backend='numpy'), [[1, 4], [2, 5], [3, 6]])
+        self.assertEqual(transpose_matrix(np.array(matrix)), [[1, 4], [2, 5], [3, 6]])
+        rng = random.Random(14)
+        matrix = [[rng.random() for _ in range(257)] for _ in range(300)]
+        self.assertEqual(transpose_matrix(matrix, backend='numpy'), transpose_matrix(matrix, backend='zip'))
+    
+    def test_transpose_matrix_edge_ragged_rows(self):
+        """Edge case: Rows of different lengths are rejected, not truncated"""
+        for backend in ['auto', 'zip', 'tiled']:
+            with self.assertRaises(ValueError):
+                transpose_matrix([[1, 2], [3]], backend)
+            with self.assertRaises(ValueError):
+                transpose_matrix([[1], [2, 3]], backend)
+        self.assertEqual(transpose_matrix([]), [])
+    
+    def test_transposed_view(self):
+        matrix = [[1, 2, 3], [4, 5, 6]]
+        view = TransposedView(matrix)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view.shape, (3, 2))
+        self.assertEqual(view[2][1], 6)
+        self.assertEqual(view[-1, 0], 3)
+        self.assertEqual(list(view[1]), [2, 5])
+        self.assertEqual([list(row) for row in view], transpose_matrix(matrix))
+        self.assertEqual(view, [[1, 4], [2, 5], [3, 6]])
+        self.assertEqual(view.materialize(), [[1, 4], [2, 5], [3, 6]])
+    
+    def test_transposed_view_reads_through(self):
+        """The view reflects the source without copying it"""
+        matrix = [[i * 1000 + j for j in range(1000)] for i in range(100)]
+        view = TransposedView(matrix)
+        self.assertEqual(view[500][25], 25500)
+        matrix[25][500] = -1
+        self.assertEqual(view[500][25], -1)
+        with self.assertRaises(IndexError):
+            view[1000]
+    
+    def test_transpose_binary_file(self):
+        """Stress test: Tiled file-to-file transpose with ragged edge tiles"""
+        rows, cols = 37, 53
+        values = array.array('d', range(rows * cols))
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'matrix.bin')
+            dst = os.path.join(tmp, 'matrix_t.bin')
+            with open(src, 'wb') as f:
+                values.tofile(f)
+            transpose_binary_file(src, dst, rows, cols, typecode='d', tile=8)
+            result = array.array('d')
+            with open(dst, 'rb') as f:
+                result.frombytes(f.read())
+        
+        matrix = [list(values[i * cols:(i + 1) * cols]) for i in range(rows)]
+        expected = transpose_matrix(matrix)
+        self.assertEqual([list(result[j * rows:(j + 1) * rows]) for j in range(cols)], expected)
+    
+    def test_transpose_binary_file_edge_wrong_size(self):
+        """Edge case: File size does not match the shape"""
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'matrix.bin')
+            with open(src, 'wb') as f:
+                array.array('d', range(10)).tofile(f)
+            with self.assertRaises(ValueError):
+                transpose_binary_file(src, os.path.join(tmp, 'out.bin'), 3, 3)
+    
+    def test_transpose_csv_file(self):
+        matrix = [[f'{i},{j}' if j % 3 == 0 else str(i * j) for j in range(13)] for i in range(250)]
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'matrix.csv')
+            dst = os.path.join(tmp, 'matrix_t.csv')
+            with open(src, 'w', newline='') as f:
+                csv.writer(f).writerows(matrix)
+            transpose_csv_file(src, dst, tile=7)
+            with open(dst, newline='') as f:
+                result = list(csv.reader(f))
+        self.assertEqual(result, transpose_matrix(matrix))
+    
+    def test_transpose_csv_file_stress_tall_input(self):
+        """Stress test: Memory stays at one band however many rows the input has"""
+        import tracemalloc
+        matrix = [[str(i), f'"q{i}"', f'a\nb{i}' if i % 997 == 0 else ''] for i in range(60000)]
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'tall.csv')
+            dst = os.path.join(tmp, 'tall_t.csv')
+            with open(src, 'w', newline='') as f:
+                csv.writer(f).writerows(matrix)
+            tracemalloc.start()
+            try:
+                transpose_csv_file(src, dst, tile=1000)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            with open(dst, newline='') as f:
+                result = list(csv.reader(f))
+        self.assertEqual(result, transpose_matrix(matrix))
+        self.assertLess(peak, 2 << 20)
+    
     # ==================================================================================
     # Question 4: Calculate Final Grades Tests
     # ==================================================================================
@@ -252,6 +632,127 @@ class TestPracticeAssessment(unittest.TestCase):
         # 40% * 85 + 30% * 90 + 30% * 95 = 89.5
         self.assertAlmostEqual(result['OnlyOne'], 89.5, places=1)
     
+    def test_calculate_final_grades_columnar_matches_dict(self):
+        """Stress test: Columnar pass matches the dict-of-dicts path"""
+        rng = random.Random(5)
+        students = {
+            f'Student_{i}': {
+                'assignments': [rng.choice([rng.randrange(101), rng.random() * 100])
+                                for _ in range(rng.randrange(1, 8))],
+                'midterm': rng.randrange(101),
+                'final': rng.random() * 100
+            }
+            for i in range(1000)
+        }
+        result = calculate_final_grades_columnar(*students_to_columns(students))
+        expected = calculate_final_grades(students)
+        self.assertEqual(list(result), list(expected))
+        for name in expected:
+            self.assertAlmostEqual(result[name], expected[name], places=9)
+    
+    def test_calculate_final_grades_columnar_plain_sequences(self):
+        result = calculate_final_grades_columnar(['Alice', 'Bob'], [88, 90], [92, 95], [80, 90, 85, 85], [0, 3, 4])
+        self.assertAlmostEqual(result['Alice'], 88.0, places=1)
+        self.assertAlmostEqual(result['Bob'], 89.5, places=1)
+    
+    def test_calculate_final_grades_columnar_edge_trailing_scores(self):
+        """Edge case: Scores past offsets[-1] are ignored"""
+        result = calculate_final_grades_columnar(['a'], [0], [0], [10, 20, 999], [0, 2])
+        self.assertAlmostEqual(result['a'], 6.0)
+        result = calculate_final_grades_columnar(['a', 'b'], [0, 0], [0, 0], [999, 10, 30, 999], [1, 2, 3])
+        self.assertAlmostEqual(result['a'], 4.0)
+        self.assertAlmostEqual(result['b'], 12.0)
+    
+    def test_calculate_final_grades_custom_weights(self):
+        students = {'OnlyOne': {'assignments': [85], 'midterm': 90, 'final': 95}}
+        self.assertAlmostEqual(calculate_final_grades(students, weights=(0.5, 0.25, 0.25))['OnlyOne'], 88.75)
+        columns = students_to_columns(students)
+        self.assertAlmostEqual(calculate_final_grades_columnar(*columns, weights=(0.5, 0.25, 0.25))['OnlyOne'], 88.75)
+    
+    def test_gradebook_matches_calculate_final_grades(self):
+        students = {
+            f'Student_{i}': {
+                'assignments': [70 + i % 30, 80 + i % 20, 75 + i % 25],
+                'midterm': 80 + i % 20,
+                'final': 85 + i % 15
+            }
+            for i in range(1000)
+        }
+        book = Gradebook.from_students(students)
+        self.assertEqual(book.snapshot(), calculate_final_grades(students))
+    
+    def test_gradebook_incremental_updates(self):
+        book = Gradebook()
+        book.add_student('OnlyOne', [85], midterm=90, final=95)
+        self.assertAlmostEqual(book.grade('OnlyOne'), 89.5)
+        
+        score_id = book.add_score('OnlyOne', 95)
+        self.assertAlmostEqual(book.grade('OnlyOne'), 91.5)
+        book.set_score('OnlyOne', score_id, 75)
+        self.assertAlmostEqual(book.grade('OnlyOne'), 87.5)
+        book.remove_score('OnlyOne', 0)
+        self.assertAlmostEqual(book.grade('OnlyOne'), 85.5)
+        book.set_exams('OnlyOne', final=100)
+        self.assertAlmostEqual(book.grade('OnlyOne'), 87.0)
+        
+        snapshot = book.snapshot()
+        book.set_score('OnlyOne', score_id, 100)
+        self.assertAlmostEqual(snapshot['OnlyOne'], 87.0)
+    
+    def test_gradebook_edge_bulk_update_and_remove(self):
+        """Edge case: Bulk replace, removal and unknown ids"""
+        book = Gradebook.from_students({'Perfect': {'assignments': [100, 100], 'midterm': 100, 'final': 100}})
+        book.update({'Struggling': {'assignments': [0], 'midterm': 0, 'final': 0},
+                     'Perfect': {'assignments': [50], 'midterm': 50, 'final': 50}})
+        self.assertEqual(book.snapshot(), {'Perfect': 50.0, 'Struggling': 0.0})
+        book.remove_student('Struggling')
+        self.assertEqual(len(book), 1)
+        with self.assertRaises(KeyError):
+            book.remove_score('Perfect', 7)
+    
+    def test_final_grades_file_jsonl_and_csv(self):
+        """Stress test: Chunked, multi-process grading of exported files"""
+        students = {
+            f'Student_{i}': {
+                'assignments': [70 + i % 30, 80 + i % 20, 75 + i % 25][:1 + i % 3],
+                'midterm': 80 + i % 20,
+                'final': 85 + i % 15
+            }
+            for i in range(1000)
+        }
+        expected = list(calculate_final_grades(students).items())
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl = os.path.join(tmp, 'grades.jsonl')
+            with open(jsonl, 'w') as f:
+                for name, record in students.items():
+                    f.write(json.dumps(dict(name=name, **record)) + '\n')
+            rows = os.path.join(tmp, 'grades.csv')
+            with open(rows, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['name', 'midterm', 'final', 'a1', 'a2', 'a3'])
+                for name, record in students.items():
+                    scores = record['assignments']
+                    writer.writerow([name, record['midterm'], record['final']] + scores + [''] * (3 - len(scores)))
+            
+            for path in (jsonl, rows):
+                self.assertEqual(list(iter_final_grades_file(path, chunk_size=64, workers=2)), expected)
+                self.assertEqual(list(iter_final_grades_file(path, chunk_size=64, workers=1)), expected)
+            
+            out = os.path.join(tmp, 'final.csv')
+            self.assertEqual(write_final_grades_file(jsonl, out, chunk_size=100, workers=2), 1000)
+            with open(out, newline='') as f:
+                written = list(csv.reader(f))
+            self.assertEqual(written[0], ['name', 'final_grade'])
+            self.assertEqual([(name, float(grade)) for name, grade in written[1:]], expected)
+    
+    def test_final_grades_file_edge_unknown_format(self):
+        """Edge case: Unsupported file extension"""
+        with self.assertRaises(ValueError):
+            list(iter_final_grades_file('grades.xlsx'))
+        # A .json export is a single document, not JSON Lines.
+        with self.assertRaises(ValueError):
+            list(iter_final_grades_file('grades.json'))
+    
     # ==================================================================================
     # Question 5: Word Frequency Tests
     # ==================================================================================
@@ -304,6 +805,154 @@ class TestPracticeAssessment(unittest.TestCase):
         result = word_frequency("one two three", 10)
         self.assertEqual(len(result), 3)
     
+    def test_tokenize_matches_word_cleaning(self):
+        def reference(text):
+            words = []
+            for word in text.lower().split():
+                cleaned = "".join([i for i in word if i.isalnum()])
+                if cleaned != "":
+                    words.append(cleaned)
+            return words
+        
+        samples = [
+            "Hello!!! World??? Test... Hello, world! Test; hello.",
+            "snake_case it's e-mail a\x1cb \u00a0caf\u00e9 na\u00efve \u0130stanbul \u00b2 \u0661\u0662",
+            "",
+            "!!! ... ???",
+        ]
+        for text in samples:
+            self.assertEqual(tokenize(text), reference(text))
+            self.assertEqual(tokenize(text.encode('utf-8')), reference(text))
+            self.assertEqual(tokenize(memoryview(text.encode('utf-8'))), reference(text))
+    
+    def test_count_words_bytes_matches_str(self):
+        """Stress test: Bytes fast path counts like the str path"""
+        text = ' '.join(f'Word{i % 50}, w\u00f6rd{i % 7}!' for i in range(20000))
+        self.assertEqual(list(count_words(text.encode()).items()), list(count_words(text).items()))
+    
+    def test_word_frequency_stream_sources(self):
+        text = "Hello!!! World??? Test... Hello, world! Test; hello."
+        expected = word_frequency(text, 3)
+        lines = text.split(" ")
+        self.assertEqual(word_frequency_stream([line + " " for line in lines], 3), expected)
+        self.assertEqual(word_frequency_stream(io.BytesIO(text.encode()), 3), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.assertEqual(word_frequency_stream(path, 3), expected)
+    
+    def test_word_frequency_stream_text_mode_files(self):
+        text = "Hello!!! World??? Test... Hello, world! Test; hello.\n" * 50
+        expected = word_frequency(text, 3)
+        self.assertEqual(word_frequency_stream(io.StringIO(text), 3), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(word_frequency_stream(f, 3), expected)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(word_frequency_stream(f, 3, approx=True), word_frequency(text, 3, approx=True))
+    
+    def test_word_frequency_stream_stress_chunk_boundaries(self):
+        """Stress test: Words and multi-byte characters straddling read chunks"""
+        words = ['caf\u00e9' + str(i % 7) + 'x' * (i % 13) for i in range(300000)]
+        text = ' '.join(words)
+        result = word_frequency_stream(io.BytesIO(text.encode('utf-8')), 20)
+        self.assertEqual(result, word_frequency(text, 20))
+    
+    def test_word_frequency_stream_edge_empty(self):
+        """Edge case: Empty stream"""
+        self.assertEqual(word_frequency_stream(io.BytesIO(b''), 5), [])
+        self.assertEqual(word_frequency_stream([], 5), [])
+    
+    def test_word_frequency_approx_exact_when_budget_fits(self):
+        result = word_frequency("The cat and the dog. The cat!", 2, approx=True)
+        self.assertEqual(result, [('the', 3, 0), ('cat', 2, 0)])
+    
+    def test_word_frequency_approx_stress_fixed_memory(self):
+        """Stress test: Many distinct words through a small sketch"""
+        rng = random.Random(7)
+        words = ['hot' + str(i % 5) if i % 3 == 0 else 'cold' + str(rng.randrange(100000))
+                 for i in range(60000)]
+        text = ' '.join(words)
+        sketch = SpaceSaving(50)
+        sketch.update(words)
+        self.assertEqual(len(sketch), 50)
+        
+        result = word_frequency(text, 5, approx=True, capacity=50)
+        self.assertEqual(sorted(word for word, _, _ in result), [f'hot{i}' for i in range(5)])
+        for word, count, error in result:
+            self.assertTrue(count - error <= 4000 <= count)
+    
+    def test_word_frequency_stream_approx(self):
+        lines = ["Hello!!! World???", "Test... Hello, world!", "Test; hello."]
+        result = word_frequency_stream(lines, 1, approx=True, capacity=2)
+        self.assertEqual(result[0][0], 'hello')
+        self.assertTrue(result[0][1] - result[0][2] <= 3 <= result[0][1])
+    
+    def test_word_frequency_parallel_matches_serial(self):
+        """Partial counts merge back with the serial tie order"""
+        words = ['word' + str((i * 7919) % 300) for i in range(30000)]
+        text = ' '.join(words) + "\nHello!!! World??? Test... Hello, world!"
+        expected = word_frequency(text, 300)
+        self.assertEqual(word_frequency_parallel(text.encode(), 300, workers=3), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'corpus.txt')
+            with open(path, 'wb') as f:
+                f.write(text.encode())
+            self.assertEqual(word_frequency_parallel(path, 300, workers=2), expected)
+            self.assertEqual(word_frequency_parallel(path, 300, workers=1), expected)
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                self.assertEqual(word_frequency_parallel(buf, 300, workers=2), expected)
+    
+    def test_word_frequency_parallel_edge_empty(self):
+        """Edge case: Empty input"""
+        self.assertEqual(word_frequency_parallel(b'', 5, workers=2), [])
+    
+    def test_word_frequency_parallel_edge_non_ascii_encoding(self):
+        """Edge case: Encodings that cannot be cut at whitespace bytes are rejected"""
+        data = 'hello world hello'.encode('utf-16')
+        with self.assertRaises(ValueError):
+            word_frequency_parallel(data, 5, workers=1, encoding='utf-16')
+        self.assertEqual(word_frequency_parallel(b'hello world hello', 1, workers=1, encoding='latin-1'),
+                         [('hello', 2)])
+    
+    def test_word_frequency_index_add_remove(self):
+        index = WordFrequencyIndex()
+        index.add("The cat and the dog.")
+        index.add("The cat!")
+        self.assertEqual(index.top(2), word_frequency("The cat and the dog. The cat!", 2))
+        
+        index.remove("The cat!")
+        self.assertEqual(index.top(5), word_frequency("The cat and the dog.", 5))
+        self.assertEqual(index.count('cat'), 1)
+        
+        index.remove("The cat and the dog.")
+        self.assertEqual(index.top(5), [])
+        self.assertEqual(len(index), 0)
+    
+    def test_word_frequency_index_edge_remove_missing(self):
+        """Edge case: Removing words that are not indexed leaves index unchanged"""
+        index = WordFrequencyIndex()
+        index.add("apple banana")
+        with self.assertRaises(ValueError):
+            index.remove("apple apple")
+        self.assertEqual(index.top(5), [('apple', 1), ('banana', 1)])
+    
+    def test_word_frequency_index_save_load(self):
+        words = ['word' + str(i % 100) for i in range(10000)]
+        index = WordFrequencyIndex()
+        for start in range(0, len(words), 1000):
+            index.add(' '.join(words[start:start + 1000]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'index.json')
+            index.save(path)
+            loaded = WordFrequencyIndex.load(path)
+        self.assertEqual(loaded.top(100), index.top(100))
+        self.assertEqual(loaded.top(100), word_frequency(' '.join(words), 100))
+    
     # ==================================================================================
     # Question 6: Remove Duplicates Preserve Order Tests
     # ==================================================================================
@@ -351,6 +1000,77 @@ class TestPracticeAssessment(unittest.TestCase):
         # Should preserve all different types
         self.assertEqual(len(result), 4)  # 1, '1', 2, '2'
     
+    def test_remove_duplicates_stress_million_items(self):
+        """Stress test: 1,000,000 items dedupe in linear time"""
+        items = [i % 50000 for i in range(1000000)]
+        result = remove_duplicates_preserve_order(items)
+        self.assertEqual(result, list(range(50000)))
+    
+    def test_remove_duplicates_edge_unhashable(self):
+        """Edge case: Unhashable items compare by value"""
+        items = [[1, 2], {'a': [1]}, [1, 2], (1, 2), {'a': [1]}, {3}, frozenset({3}), (1, [2]), (1, [2])]
+        result = remove_duplicates_preserve_order(items)
+        self.assertEqual(result, [[1, 2], {'a': [1]}, (1, 2), {3}, (1, [2])])
+    
+    def test_iter_unique_lazy_with_key(self):
+        def endless():
+            i = 0
+            while True:
+                yield i % 3
+                i += 1
+        unique = iter_unique(endless())
+        self.assertEqual([next(unique) for _ in range(3)], [0, 1, 2])
+        self.assertEqual(list(iter_unique(['a', 'B', 'b', 'A', 'c'], key=str.lower)), ['a', 'B', 'c'])
+    
+    def test_iter_unique_external_spills_to_disk(self):
+        """Stress test: Input larger than the memory budget"""
+        rng = random.Random(11)
+        items = [rng.randrange(5000) for _ in range(30000)] + [[1, 2], {'a': 1}, [1, 2]]
+        expected = remove_duplicates_preserve_order(items)
+        with tempfile.TemporaryDirectory() as tmp:
+            result = list(iter_unique_external(items, memory_budget=20000, partitions=4, tmpdir=tmp))
+            self.assertEqual(result, expected)
+            self.assertEqual(os.listdir(tmp), [])
+            
+            # Tiny partitions force a second level of splitting
+            result = list(iter_unique_external(items, memory_budget=2000, partitions=2, tmpdir=tmp))
+            self.assertEqual(result, expected)
+    
+    def test_iter_unique_external_stress_bounded_memory(self):
+        """Stress test: Peak memory follows the budget, not the input size"""
+        import tracemalloc
+        rng = random.Random(12)
+        items = [rng.randrange(40000) for _ in range(80000)]
+        budget = 256 << 10
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_unique_external(iter(items), memory_budget=budget))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, len(set(items)))
+        self.assertLess(peak, 2 * budget)
+    
+    def test_iter_unique_external_bloom_filter(self):
+        items = list(range(20000)) + list(range(0, 20000, 7))
+        result = list(iter_unique_external(items, memory_budget=10000, bloom_bits=1 << 20))
+        self.assertEqual(result, list(range(20000)))
+    
+    def test_iter_unique_external_edge_unfreezable_items(self):
+        """Edge case: Items that cannot be hashed or frozen still dedupe after spilling"""
+        rng = random.Random(111)
+        items = [rng.choice([rng.randrange(500), _UnhashableRecord(rng.randrange(50))]) for _ in range(5000)]
+        expected = remove_duplicates_preserve_order(items)
+        for bloom_bits in (0, 1 << 16):
+            result = list(iter_unique_external(items, memory_budget=5000, partitions=4, bloom_bits=bloom_bits))
+            self.assertEqual(result, expected)
+        self.assertEqual(sum(isinstance(item, _UnhashableRecord) for item in expected), 50)
+    
+    def test_iter_unique_external_edge_fits_in_memory(self):
+        """Edge case: Small input never touches disk"""
+        self.assertEqual(list(iter_unique_external([1, '1', 1, 2, '2', 2])), [1, '1', 2, '2'])
+        self.assertEqual(list(iter_unique_external([])), [])
+    
     # ==================================================================================
     # Question 7: Validate Password Tests
     # ==================================================================================
@@ -454,6 +1174,117 @@ class TestPracticeAssessment(unittest.TestCase):
         """Edge case: Limit of 1"""
         self.assertEqual(generate_primes(1), [])
     
+    def test_generate_primes_stress_segment_boundaries(self):
+        """Stress test: Limits spanning several sieve segments"""
+        result = generate_primes(2000000)
+        
+        # There are 148933 primes less than 2,000,000
+        self.assertEqual(len(result), 148933)
+        self.assertEqual(result[-1], 1999993)
+        self.assertEqual(generate_primes(1999993)[-1], 1999979)
+    
+    def test_generate_primes_workers_matches_serial(self):
+        """Process-pool sieve stitches segments back in order"""
+        limit = 3000001
+        self.assertEqual(generate_primes(limit, workers=2), generate_primes(limit))
+    
+    def test_generate_primes_workers_small_limit(self):
+        """Edge case: Small limits with workers fall back to in-process sieve"""
+        self.assertEqual(generate_primes(20, workers=4), [2, 3, 5, 7, 11, 13, 17, 19])
+        self.assertEqual(generate_primes(2, workers=4), [])
+    
+    def test_prime_store_extends_incrementally(self):
+        """Prime store answers from the map and sieves only the new range"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'primes.bin')
+            with PrimeStore(path) as store:
+                self.assertEqual(store.primes(20), [2, 3, 5, 7, 11, 13, 17, 19])
+                self.assertEqual(generate_primes(10000, store=store), generate_primes(10000))
+                covered = store.limit
+                size = os.path.getsize(path)
+                self.assertEqual(store.primes(100), generate_primes(100))
+                self.assertEqual((store.limit, os.path.getsize(path)), (covered, size))
+            
+            # A second handle shares the table on disk
+            with PrimeStore(path) as store:
+                self.assertGreaterEqual(store.limit, 10000)
+                self.assertEqual(store.primes(3), [2])
+                self.assertEqual(store.primes(0), [])
+    
+    def test_prime_store_edge_not_a_store(self):
+        """Edge case: A foreign file is rejected and its handle closed"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'other.bin')
+            with open(path, 'wb') as f:
+                f.write(b'x' * 32)
+            opened = []
+            real_fdopen = os.fdopen
+            
+            def recording_fdopen(*args, **kwargs):
+                opened.append(real_fdopen(*args, **kwargs))
+                return opened[-1]
+            
+            with mock.patch('os.fdopen', recording_fdopen):
+                with self.assertRaises(ValueError):
+                    PrimeStore(path)
+            self.assertTrue(opened[0].closed)
+    
+    def test_iter_primes_matches_generate_primes(self):
+        for limit in [0, 1, 2, 3, 4, 20, 10000]:
+            self.assertEqual(list(iter_primes(limit)), generate_primes(limit))
+    
+    def test_iter_primes_lazy(self):
+        """iter_primes yields without sieving the whole range up front"""
+        primes = iter_primes(10 ** 12)
+        self.assertEqual([next(primes) for _ in range(5)], [2, 3, 5, 7, 11])
+    
+    def test_is_prime_matches_sieve(self):
+        primes = set(generate_primes(100000))
+        self.assertTrue(all(is_prime(n) == (n in primes) for n in range(-10, 100000)))
+    
+    def test_is_prime_stress_64_bit(self):
+        """Stress test: Large primes and strong pseudoprimes"""
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertTrue(is_prime(2 ** 64 - 59))
+        self.assertFalse(is_prime(3825123056546413051))  # pseudoprime to bases 2..23
+        self.assertFalse(is_prime((2 ** 31 - 1) * (2 ** 61 - 1)))
+    
+    def test_is_prime_stress_above_64_bit(self):
+        """Stress test: Pseudoprimes to the first 12 and 13 prime bases are rejected"""
+        self.assertFalse(is_prime(318665857834031151167461))  # psi_12
+        self.assertFalse(is_prime(3317044064679887385961981))  # psi_13
+        self.assertTrue(is_prime(2 ** 89 - 1))
+        self.assertTrue(is_prime(2 ** 127 - 1))
+        self.assertFalse(is_prime((2 ** 89 - 1) * (2 ** 61 - 1)))
+        self.assertFalse(is_prime((2 ** 40 + 15) ** 2))
+        self.assertEqual(next_prime(2 ** 64), 2 ** 64 + 13)
+        self.assertEqual(next_prime(2 ** 128), 2 ** 128 + 51)
+    
+    def test_next_prime(self):
+        self.assertEqual(next_prime(-5), 2)
+        self.assertEqual(next_prime(2), 3)
+        self.assertEqual(next_prime(13), 17)
+        self.assertEqual(next_prime(2 ** 64 - 60), 2 ** 64 - 59)
+    
+    def test_prime_count(self):
+        self.assertEqual(prime_count(0, 100), 25)
+        self.assertEqual(prime_count(2, 3), 1)
+        self.assertEqual(prime_count(3, 3), 0)
+        self.assertEqual(prime_count(10, 2), 0)
+        self.assertEqual(prime_count(1000, 2000000), 148933 - 168)
+        self.assertEqual(prime_count(10 ** 18, 10 ** 18 + 100), 4)
+    
+    def test_nth_prime(self):
+        primes = generate_primes(200000)
+        for k in [1, 2, 10, 6542, 6543, len(primes)]:
+            self.assertEqual(nth_prime(k), primes[k - 1])
+        with self.assertRaises(ValueError):
+            nth_prime(0)
+    
+    def test_prime_queries_batch(self):
+        self.assertEqual(is_prime_many([1, 2, 9, 11]), [False, True, False, True])
+        self.assertEqual(next_prime_many(iter([0, 13, 100])), [2, 17, 101])
+    
     # ==================================================================================
     # Question 9: Binary Search Tests
     # ==================================================================================
@@ -517,7 +1348,138 @@ class TestPracticeAssessment(unittest.TestCase):
         self.assertGreaterEqual(result, 0)
         self.assertLess(result, 1000)
         self.assertEqual(sorted_list[result], 5)
-
+    
+    def test_binary_search_second_to_last_element(self):
+        self.assertEqual(binary_search([1, 3, 5, 7, 9], 7), 3)
+        sorted_list = list(range(0, 2000, 2))
+        for i, value in enumerate(sorted_list):
+            self.assertEqual(binary_search(sorted_list, value), i)
+    
+    def test_binary_search_many(self):
+        self.assertEqual(binary_search_many([1, 3, 5, 7, 9], [9, 4, 1, 7, 7, 10, 0]),
+                         [4, -1, 0, 3, 3, -1, -1])
+        self.assertEqual(binary_search_many([1, 2, 2, 2, 3], [2]), [1])
+        self.assertEqual(binary_search_many([], [1, 2]), [-1, -1])
+        self.assertEqual(binary_search_many([1, 2], []), [])
+        self.assertEqual(binary_search_many(['a', 'c', 'e'], ['e', 'b', 'a']), [2, -1, 0])
+    
+    def test_binary_search_many_stress_matches_binary_search(self):
+        """Stress test: 20,000 random queries against 100,000 even numbers"""
+        sorted_list = list(range(0, 200000, 2))
+        rng = random.Random(23)
+        targets = [rng.randrange(-10, 200010) for _ in range(20000)]
+        expected = [binary_search(sorted_list, t) for t in targets]
+        self.assertEqual(binary_search_many(sorted_list, targets), expected)
+        self.assertEqual(binary_search_many(sorted_list, iter(targets)), expected)
+    
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_binary_search_many_numpy(self):
+        sorted_list = list(range(0, 2000, 2))
+        targets = [1998, 3, 0, 1000, -2, 2000] * 100
+        expected = [binary_search(sorted_list, t) for t in targets]
+        self.assertEqual(binary_search_many(sorted_list, targets), expected)
+        self.assertEqual(binary_search_many(np.array(sorted_list), targets[:3]), expected[:3])
+        with mock.patch.object(np, 'asarray', side_effect=AssertionError('converted')):
+            # A small batch against a long list must not convert it.
+            self.assertEqual(binary_search_many(sorted_list, targets[:6]), expected[:6])
+    
+    def test_sorted_index_queries(self):
+        index = SortedIndex([1, 2, 2, 2, 3, 5])
+        self.assertEqual(len(index), 6)
+        self.assertEqual(index.find(2), 1)
+        self.assertEqual(index.find_right(2), 3)
+        self.assertEqual(index.find(4), -1)
+        self.assertEqual(index.find_right(4), -1)
+        self.assertEqual(index.lower_bound(4), 5)
+        self.assertEqual(index.upper_bound(2), 4)
+        self.assertEqual(index.lower_bound(0), 0)
+        self.assertEqual(index.upper_bound(5), 6)
+        self.assertIn(5, index)
+        self.assertNotIn(6, index)
+    
+    def test_sorted_index_edge_empty_and_single(self):
+        empty = SortedIndex([])
+        self.assertEqual(empty.find(1), -1)
+        self.assertEqual(empty.lower_bound(1), 0)
+        single = SortedIndex([42])
+        self.assertEqual(single.find(42), 0)
+        self.assertEqual(single.find(10), -1)
+        self.assertEqual(single.upper_bound(42), 1)
+    
+    def test_sorted_index_stress_matches_bisect(self):
+        """Stress test: every size up to 70 and a 50,000-key index with duplicates"""
+        rng = random.Random(24)
+        for n in list(range(70)) + [50000]:
+            keys = sorted(rng.randrange(-n, n + 1) for _ in range(n))
+            index = SortedIndex(keys)
+            for target in range(-n - 2, n + 3, max(1, n // 500)):
+                left, right = bisect.bisect_left(keys, target), bisect.bisect_right(keys, target)
+                self.assertEqual(index.lower_bound(target), left)
+                self.assertEqual(index.upper_bound(target), right)
+                self.assertEqual(index.find(target), left if left < right else -1)
+                self.assertEqual(index.find_right(target), right - 1 if left < right else -1)
+                if left < right:
+                    self.assertEqual(keys[binary_search(keys, target)], target)
+    
+    def test_sorted_key_file_search(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'keys.bin')
+            write_sorted_keys(path, [-10, -5, -1, 0, 3, 3, 7, 12])
+            self.assertEqual(os.path.getsize(path), 64)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(8), struct.pack('<q', -10))
+            for interpolation in (False, True):
+                with SortedKeyFile(path, interpolation=interpolation) as keys:
+                    self.assertEqual(len(keys), 8)
+                    self.assertEqual(keys.search(-5), 1)
+                    self.assertEqual(keys.search(3), 4)
+                    self.assertEqual(keys.search(12), 7)
+                    self.assertEqual(keys.search(4), -1)
+                    self.assertEqual(keys.search(-11), -1)
+                    self.assertEqual(keys.upper_bound(3), 6)
+                    self.assertIn(0, keys)
+                    # Non-integer keys behave the same in both modes.
+                    self.assertEqual(keys.search(3.5), -1)
+                    self.assertEqual(keys.search(3.0), 4)
+                    self.assertEqual(keys.lower_bound(6.9), 6)
+    
+    def test_sorted_key_file_stress_matches_binary_search(self):
+        """Stress test: 100,000 keys, uniform and skewed, both search modes"""
+        rng = random.Random(25)
+        uniform = list(range(0, 200000, 2))
+        skewed = sorted(rng.randrange(1 << 40) ** 2 >> 40 for _ in range(100000))
+        targets = [rng.randrange(-10, 200010) for _ in range(2000)]
+        with tempfile.TemporaryDirectory() as workdir:
+            for sorted_list, width, signed in ((uniform, 4, False), (skewed, 8, True)):
+                path = os.path.join(workdir, f'keys-{width}.bin')
+                write_sorted_keys(path, sorted_list, width=width, signed=signed)
+                queries = targets + sorted_list[::97]
+                expected = [bisect.bisect_left(sorted_list, t) for t in queries]
+                expected = [i if i < len(sorted_list) and sorted_list[i] == t else -1
+                            for i, t in zip(expected, queries)]
+                for interpolation in (False, True):
+                    with SortedKeyFile(path, width, signed, interpolation) as keys:
+                        self.assertEqual([keys.search(t) for t in queries], expected)
+    
+    def test_sorted_key_file_edge_empty_bad_size_and_big_endian_host(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'keys.bin')
+            write_sorted_keys(path, [])
+            with SortedKeyFile(path, interpolation=True) as keys:
+                self.assertEqual(len(keys), 0)
+                self.assertEqual(keys.search(1), -1)
+            with open(path, 'wb') as file:
+                file.write(b'\x00' * 7)
+            with self.assertRaises(ValueError):
+                SortedKeyFile(path)
+            with self.assertRaises(ValueError):
+                SortedKeyFile(path, width=3)
+            write_sorted_keys(path, [1, 300, 70000], width=4)
+            with mock.patch.object(sys, 'byteorder', 'big'):
+                with SortedKeyFile(path, width=4) as keys:
+                    self.assertEqual([keys[i] for i in range(3)], [1, 300, 70000])
+                    self.assertEqual(keys.search(300), 1)
+                    self.assertEqual(keys.search(2), -1)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file